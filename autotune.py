@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+import os
+import yaml
+import random
+import argparse
+import statistics
+from multiprocessing import Pool
+from typing import Dict, List, Tuple
+from simulator import Metrics
+from main import ALGORITHMS, run_algorithm, get_percentile
+
+# For each timeout in the node class's DEFAULT_TIMEOUTS, either (low, high) in seconds
+# or (base, low, high): a multiple of a timeout listed earlier, so that pairs such as
+# election_min/election_max and heartbeat_interval/heartbeat_timeout stay ordered
+SEARCH_SPACES = {
+    "Bully": {"ok": (0.05, 0.6), "heartbeat_interval": (0.02, 0.3),
+              "heartbeat_timeout": ("heartbeat_interval", 2.0, 6.0)},
+    "Ring": {"leader_timeout": (0.2, 1.5), "ping_interval": (0.1, 1.0),
+             "ping_timeout": (0.1, 0.8), "token_interval": (0.05, 0.5)},
+    "Raft": {"election_min": (0.1, 0.8), "election_max": ("election_min", 1.2, 2.5),
+             "heartbeat_interval": ("election_min", 0.1, 0.5), "retransmit": (0.1, 0.8)},
+    "Multi-Attr": {"ok": (0.05, 0.6), "heartbeat_interval": (0.02, 0.3),
+                   "heartbeat_timeout": ("heartbeat_interval", 2.0, 6.0)},
+    "Latency": {"ok": (0.05, 0.6), "heartbeat_interval": (0.02, 0.3),
+                "heartbeat_timeout": ("heartbeat_interval", 2.0, 6.0),
+                "probe_interval": (0.05, 0.5), "rtt_ttl": (1.0, 5.0), "min_tenure": (0.2, 2.0),
+                "handoff_hold": (0.1, 1.0)},
+}
+
+def sample_params(space: dict, rng: random.Random) -> Dict[str, float]:
+    params = {}
+    for key, bounds in space.items():
+        if isinstance(bounds[0], str):
+            base, lo, hi = bounds
+            params[key] = round(params[base] * rng.uniform(lo, hi), 3)
+        else:
+            params[key] = round(rng.uniform(*bounds), 3)
+    return params
+
+def false_elections(metrics: Metrics) -> int:
+    """Times a live leader lost leadership before the crash; only noise can cause these."""
+    # The crash fires on the simulator's float clock, which can be just before kill_time
+    crash_time = metrics.crash_time if metrics.crash_time is not None else float("inf")
+    count = 0
+    for previous, interval in zip(metrics.timeline, metrics.timeline[1:]):
+        if interval.start >= crash_time:
+            break
+        if previous.leader_count == 1:
+            count += 1
+    return count
+
+def _evaluate_trial(task: Tuple[int, str, Dict[str, float], dict, int]) -> Tuple[int, float, int, int]:
+    """Pool worker: one simulation of one candidate with a fixed seed."""
+    candidate, name, params, config, seed = task
+    node_class = dict(ALGORITHMS)[name]
+    random.seed(seed)
+    cfg = dict(config, timeouts={name: params})
+    metrics = run_algorithm(name, node_class, cfg)
+    return candidate, metrics.reelection_time, false_elections(metrics), metrics.messages_sent
+
+class Candidate:
+    def __init__(self, params: Dict[str, float]):
+        self.params = params
+        self.reelection: List[float] = []
+        self.false_elections: List[int] = []
+        self.messages: List[int] = []
+
+    def p95(self) -> float:
+        return get_percentile(self.reelection, 95)
+
+    def mean_false(self) -> float:
+        return statistics.mean(self.false_elections)
+
+    def mean_messages(self) -> float:
+        return statistics.mean(self.messages)
+
+    def score(self, max_false: float, max_messages: float) -> Tuple[float, float]:
+        """Constraint violation first, then P95 re-election time; lower is better."""
+        violation = max(0.0, self.mean_false() - max_false) + max(0.0, self.mean_messages() / max_messages - 1)
+        return violation, self.p95()
+
+def successive_halving(name: str, config: dict, settings: dict, pool: Pool) -> Tuple[Candidate, Candidate, float]:
+    """Random candidates, evaluated on common seeds. Each rung keeps the best 1/eta
+    and gives the survivors eta times as many trials. Returns (best, defaults, message cap)."""
+    rng = random.Random(settings["seed"])
+    space = SEARCH_SPACES[name]
+    defaults = dict(ALGORITHMS)[name].DEFAULT_TIMEOUTS
+    candidates = [Candidate(dict(defaults))]
+    for _ in range(settings["candidates"] - 1):
+        candidates.append(Candidate(sample_params(space, rng)))
+
+    alive = list(range(len(candidates)))
+    trials_done = 0
+    trials = settings["min_trials"]
+    max_messages = None
+    while True:
+        tasks = [(i, name, candidates[i].params, config, settings["seed"] + t)
+                 for i in alive for t in range(trials_done, trials)]
+        for i, reelection, false, messages in pool.map(_evaluate_trial, tasks):
+            candidates[i].reelection.append(reelection)
+            candidates[i].false_elections.append(false)
+            candidates[i].messages.append(messages)
+        trials_done = trials
+
+        if max_messages is None:
+            max_messages = settings.get("max_messages") or settings["message_slack"] * candidates[0].mean_messages()
+        alive.sort(key=lambda i: candidates[i].score(settings["max_false_elections"], max_messages))
+        if len(alive) == 1 or trials >= settings["max_trials"]:
+            return candidates[alive[0]], candidates[0], max_messages
+        alive = alive[:max(1, len(alive) // settings["eta"])]
+        trials = min(trials * settings["eta"], settings["max_trials"])
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune per-algorithm timeouts for each config file.")
+    parser.add_argument("configs", nargs="*", default=["config.yaml"])
+    args = parser.parse_args()
+
+    for path in args.configs:
+        with open(path, "r") as f:
+            config = yaml.safe_load(f)
+
+        settings = {
+            "algorithms": [name for name, _ in ALGORITHMS],
+            "candidates": 32,
+            "min_trials": 4,
+            "max_trials": 32,
+            "eta": 2,
+            "max_false_elections": 0.25,  # Mean per run
+            "max_messages": None,         # Defaults to message_slack x the default timeouts
+            "message_slack": 1.5,
+            "workers": os.cpu_count(),
+            "seed": 0
+        }
+        settings.update(config.get("autotune", {}))
+
+        print("=" * 100)
+        print(f"Timeout Autotuning: {path}")
+        print("=" * 100)
+        print(f"Successive halving: {settings['candidates']} candidates, {settings['min_trials']}-"
+              f"{settings['max_trials']} trials, eta {settings['eta']}, {settings['workers']} workers")
+        print(f"Objective: P95 re-election; mean false elections <= {settings['max_false_elections']}")
+        print("=" * 100)
+        print()
+        print(f"{'Algorithm':<10} | {'Params':<9} | {'P95 re-elec (s)':>15} | {'False elections':>15} | {'Messages':>9}")
+        print("-" * 100)
+
+        tuned = {}
+        with Pool(settings["workers"]) as pool:
+            for name in settings["algorithms"]:
+                best, default, max_messages = successive_halving(name, config, settings, pool)
+                tuned[name] = best.params
+                for label, c in (("default", default), ("tuned", best)):
+                    print(f"{name:<10} | {label:<9} | {c.p95():15.3f} | {c.mean_false():15.2f} | {c.mean_messages():9.0f}")
+                print(f"{'':<10} | {'':<9} | message cap {max_messages:.0f}; tuned: {best.params}")
+                print("-" * 100)
+
+        out_path = os.path.splitext(path)[0] + ".tuned.yaml"
+        with open(out_path, "w") as f:
+            yaml.safe_dump({"timeouts": tuned}, f, sort_keys=False)
+        print(f"\nWrote {out_path}; merge its timeouts section into {path} to use it.\n")
+
+if __name__ == "__main__":
+    main()
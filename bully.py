@@ -1,9 +1,15 @@
 from simulator import Node, Message, NodeState
-from typing import List
+from typing import List, Dict, Optional
 
 class BullyNode(Node):
-    def __init__(self, node_id: int, total_nodes: int):
-        super().__init__(node_id, total_nodes)
+    DEFAULT_TIMEOUTS = {
+        "ok": 0.2,
+        "heartbeat_interval": 0.1,
+        "heartbeat_timeout": 0.4
+    }
+
+    def __init__(self, node_id: int, total_nodes: int, timeouts: Optional[Dict[str, float]] = None):
+        super().__init__(node_id, total_nodes, timeouts)
         self.awaiting_ok = False
         self.ok_timeout = None
         self.heartbeat_timeout = None
@@ -14,7 +20,7 @@ class BullyNode(Node):
             return []
         self.state = NodeState.CANDIDATE
         self.awaiting_ok = True
-        self.ok_timeout = current_time + 0.2
+        self.ok_timeout = current_time + self.timeouts["ok"]
         
         messages = []
         higher_nodes = [i for i in range(self.node_id + 1, self.total_nodes)]
@@ -74,17 +80,17 @@ class BullyNode(Node):
             self.leader_id = msg.data["leader_id"]
             self.state = NodeState.FOLLOWER
             self.awaiting_ok = False
-            self.heartbeat_timeout = current_time + 0.4
+            self.heartbeat_timeout = current_time + self.timeouts["heartbeat_timeout"]
 
         elif msg.type == "HEARTBEAT":
             if self.leader_id is None or msg.data["leader_id"] == self.leader_id:
                 self.leader_id = msg.data["leader_id"]
                 self.state = NodeState.FOLLOWER
-                self.heartbeat_timeout = current_time + 0.4
+                self.heartbeat_timeout = current_time + self.timeouts["heartbeat_timeout"]
             elif msg.data["leader_id"] > self.node_id:
                 self.leader_id = msg.data["leader_id"]
                 self.state = NodeState.FOLLOWER
-                self.heartbeat_timeout = current_time + 0.4
+                self.heartbeat_timeout = current_time + self.timeouts["heartbeat_timeout"]
             
         return responses
 
@@ -92,7 +98,7 @@ class BullyNode(Node):
         responses = []
         
         if self.state == NodeState.LEADER:
-            if current_time - self.last_heartbeat_sent >= 0.1:
+            if current_time - self.last_heartbeat_sent >= self.timeouts["heartbeat_interval"]:
                 self.last_heartbeat_sent = current_time
                 for i in range(self.total_nodes):
                     if i != self.node_id:
@@ -127,3 +133,12 @@ class BullyNode(Node):
                         ))
         return responses
 
+    def next_wakeup(self) -> float:
+        wakeups = [float("inf")]
+        if self.state == NodeState.LEADER:
+            wakeups.append(self.last_heartbeat_sent + self.timeouts["heartbeat_interval"])
+        if self.state == NodeState.FOLLOWER and self.leader_id is not None and self.heartbeat_timeout:
+            wakeups.append(self.heartbeat_timeout)
+        if self.state == NodeState.CANDIDATE and self.awaiting_ok and self.ok_timeout:
+            wakeups.append(self.ok_timeout)
+        return min(wakeups)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import yaml
+import random
+from simulator import Metrics, Simulator, NodeState
+from main import ALGORITHMS, build_simulator, run_algorithm
+
+# Used when config.yaml has no service_model section
+DEFAULT_SERVICE_MODEL = {
+    "default_send_cost_ms": 1.0,
+    "default_receive_cost_ms": 0.5,
+    "queue_capacity": 1000,
+    "overflow_policy": "tail_drop"
+}
+
+def leadership_losses(metrics: Metrics) -> int:
+    """Times a single leader gave way to anything else: another leader, none, or several."""
+    return sum(1 for previous, interval in zip(metrics.timeline, metrics.timeline[1:])
+               if previous.leader_count == 1)
+
+class CampaignTracker:
+    """Simulated time during which any live node is campaigning (in CANDIDATE state)."""
+
+    def __init__(self, sim: Simulator):
+        self.sim = sim
+        self.campaign_time = 0.0
+
+    def __call__(self, current_time: float):
+        if any(n.state == NodeState.CANDIDATE for n in self.sim.nodes if not n.crashed):
+            self.campaign_time += 0.01  # One simulator step
+
+    def campaigning(self) -> int:
+        return sum(1 for n in self.sim.nodes if not n.crashed and n.state == NodeState.CANDIDATE)
+
+def main():
+    with open("config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+
+    settings = {"cluster_sizes": [10, 25, 50, 100, 200], "seed": 0}
+    settings.update(config.get("capacity", {}))
+    service_model = config.get("service_model") or DEFAULT_SERVICE_MODEL
+
+    # No injected faults and no message loss (synthetic or traced), so leader changes
+    # and campaigning come from load; the whole run is needed to catch them, so
+    # early stopping is off
+    base = dict(config, leader_kill_time=float("inf"), enable_restart=False,
+                enable_partition=False, message_loss_prob=0.0, network_trace=None,
+                service_model=service_model, quiescence_window=None)
+
+    print("=" * 146)
+    print("Leader Capacity Sweep (no injected faults, no message loss)")
+    print("=" * 146)
+    print(f"Service model: {service_model}")
+    print("=" * 146)
+    print()
+    print(f"{'Algorithm':<10} | {'Nodes':>5} | {'Leader losses':>13} | {'Leaderless (s)':>14} | {'Split (s)':>9} | "
+          f"{'Avail (%)':>9} | {'Campaign (s)':>12} | {'Candidates':>10} | {'Drops':>6} | "
+          f"{'Mean queue (ms)':>15} | {'Max queue (ms)':>14}")
+    print("-" * 146)
+
+    for name, node_class in ALGORITHMS:
+        for n in settings["cluster_sizes"]:
+            random.seed(settings["seed"])
+            config_n = dict(base, num_nodes=n)
+            sim = build_simulator(node_class, config_n)
+            campaigns = CampaignTracker(sim)
+            sim.tick_hooks.append(campaigns)
+            m = run_algorithm(name, node_class, config_n, sim=sim)
+            print(f"{name:<10} | {n:>5} | {leadership_losses(m):>13} | {m.leaderless_time:14.2f} | "
+                  f"{m.split_brain_time:9.2f} | {m.availability:9.1f} | {campaigns.campaign_time:12.2f} | "
+                  f"{campaigns.campaigning():>10} | {m.queue_drops:>6} | "
+                  f"{m.mean_queue_delay * 1000:15.2f} | {m.max_queue_delay * 1000:14.2f}")
+        print("-" * 146)
+    print()
+
+if __name__ == "__main__":
+    main()
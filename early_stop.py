@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import sys
+import yaml
+import random
+import statistics
+from simulator import RATE_TOLERANCE
+from main import ALGORITHMS, run_algorithm
+
+def relative_error(estimate: float, actual: float) -> float:
+    return abs(estimate - actual) / actual if actual else 0.0
+
+def main():
+    with open("config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+
+    settings = {"duration": 10.0, "quiescence_window": 0.3, "trials": 5, "tolerance": 0.1, "seed": 0,
+                "rate_tolerance": config.get("rate_tolerance", RATE_TOLERANCE)}
+    settings.update(config.get("early_stop", {}))
+    full_config = dict(config, duration=settings["duration"], quiescence_window=None)
+    early_config = dict(full_config, quiescence_window=settings["quiescence_window"],
+                        rate_tolerance=settings["rate_tolerance"])
+    # The same early stopping at the duration other tools run for
+    configured_duration = config.get("duration", 5.0)
+    configured_config = dict(early_config, duration=configured_duration)
+
+    print("=" * 124)
+    print("Early-Stop Check: extrapolated totals vs full runs (same seeds)")
+    print("=" * 124)
+    print(f"Duration {settings['duration']}s, quiescence window {settings['quiescence_window']}s, "
+          f"rate tolerance {settings['rate_tolerance']:.0%}, {settings['trials']} trials, "
+          f"tolerance {settings['tolerance']:.0%}")
+    print("=" * 124)
+    print()
+    stopped_at_configured = f"Stopped at {configured_duration:g}s"
+    print(f"{'Algorithm':<10} | {'Stopped':>7} | {'Diverged':>8} | {'Mean stop (s)':>13} | {'Messages err':>12} | "
+          f"{'Bytes err':>9} | {'Avail err (pt)':>14} | {stopped_at_configured:>15} | {'Result'}")
+    print("-" * 124)
+
+    failed = False
+    for name, node_class in ALGORITHMS:
+        stops, msg_errors, byte_errors, avail_errors = [], [], [], []
+        diverged = 0  # Full runs whose leadership changed after the early stop
+        configured_stops = []
+        for trial in range(settings["trials"]):
+            random.seed(settings["seed"] + trial)
+            stopped_at = run_algorithm(name, node_class, configured_config).stopped_at
+            if stopped_at is not None:
+                configured_stops.append(stopped_at)
+            # Identical seeds make both runs identical up to the stop
+            random.seed(settings["seed"] + trial)
+            full = run_algorithm(name, node_class, full_config)
+            random.seed(settings["seed"] + trial)
+            early = run_algorithm(name, node_class, early_config)
+            if early.stopped_at is None:
+                continue
+            stops.append(early.stopped_at)
+            diverged += any(iv.start > early.stopped_at for iv in full.timeline)
+            msg_errors.append(relative_error(early.messages_sent, full.messages_sent))
+            byte_errors.append(relative_error(early.bytes_sent, full.bytes_sent))
+            avail_errors.append(abs(early.availability - full.availability))
+
+        configured = f"{len(configured_stops)}/{settings['trials']}"
+        if configured_stops:
+            configured += f" at {statistics.mean(configured_stops):.2f}s"
+        if not stops:
+            print(f"{name:<10} | {0:>7} | {'n/a':>8} | {'n/a':>13} | {'n/a':>12} | {'n/a':>9} | {'n/a':>14} | "
+                  f"{configured:>15} | never stopped")
+            continue
+        msg_err, byte_err = statistics.mean(msg_errors), statistics.mean(byte_errors)
+        ok = msg_err <= settings["tolerance"] and byte_err <= settings["tolerance"]
+        failed = failed or not ok
+        print(f"{name:<10} | {len(stops):>7} | {diverged:>8} | {statistics.mean(stops):13.2f} | {msg_err:12.1%} | "
+              f"{byte_err:9.1%} | {statistics.mean(avail_errors):14.1f} | {configured:>15} | {'ok' if ok else 'FAIL'}")
+    print()
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
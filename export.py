@@ -0,0 +1,78 @@
+import csv
+from typing import List, Tuple
+from simulator import Metrics
+
+TRIAL_FIELDS = [
+    "election_time", "reelection_time", "messages_sent", "final_leaders",
+    "messages_election", "messages_reelection",
+    "availability", "leaderless_time", "split_brain_time", "leader_changes",
+    "queue_drops", "queue_deferrals", "mean_queue_delay", "max_queue_delay",
+    "bytes_sent", "bytes_election", "bytes_reelection",
+    "peak_link_bytes_per_sec", "peak_link_utilization",
+    "crash_time", "stopped_at",
+]
+
+INTERVAL_FIELDS = ["start", "end", "leader_count", "leader_id", "leader_ids"]
+
+def _trial_rows(results: List[Tuple[str, List[Metrics]]]):
+    for name, metrics_list in results:
+        for trial, m in enumerate(metrics_list):
+            yield [name, trial] + [getattr(m, f) for f in TRIAL_FIELDS]
+
+def _interval_rows(results: List[Tuple[str, List[Metrics]]]):
+    for name, metrics_list in results:
+        for trial, m in enumerate(metrics_list):
+            for iv in m.timeline:
+                leader_id = iv.leader_id if iv.leader_id is not None else -1
+                # Every live leader, ";"-separated, so split-brain intervals keep their members
+                leader_ids = ";".join(str(i) for i in iv.leader_ids)
+                yield [name, trial, iv.start, iv.end, iv.leader_count, leader_id, leader_ids]
+
+def export_csv(results: List[Tuple[str, List[Metrics]]], prefix: str) -> List[str]:
+    """Write <prefix>_trials.csv and <prefix>_intervals.csv. Returns the paths written."""
+    trials_path = f"{prefix}_trials.csv"
+    intervals_path = f"{prefix}_intervals.csv"
+
+    with open(trials_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["algorithm", "trial"] + TRIAL_FIELDS)
+        writer.writerows(_trial_rows(results))
+
+    with open(intervals_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["algorithm", "trial"] + INTERVAL_FIELDS)
+        writer.writerows(_interval_rows(results))
+
+    return [trials_path, intervals_path]
+
+def export_npz(results: List[Tuple[str, List[Metrics]]], path: str) -> List[str]:
+    """Write one .npz with a column per field, prefixed by trial_ or interval_."""
+    import numpy as np
+
+    trials = list(_trial_rows(results))
+    intervals = list(_interval_rows(results))
+
+    columns = {
+        "trial_algorithm": np.array([r[0] for r in trials], dtype=str),
+        "trial_index": np.array([r[1] for r in trials], dtype=np.int32),
+    }
+    for i, f in enumerate(TRIAL_FIELDS):
+        # Optional fields (e.g. crash_time) are None when unset; store those as NaN
+        values = [r[i + 2] for r in trials]
+        if any(v is None for v in values):
+            values = [np.nan if v is None else v for v in values]
+        columns[f"trial_{f}"] = np.array(values)
+
+    columns["interval_algorithm"] = np.array([r[0] for r in intervals], dtype=str)
+    columns["interval_trial"] = np.array([r[1] for r in intervals], dtype=np.int32)
+    for i, f in enumerate(INTERVAL_FIELDS):
+        columns[f"interval_{f}"] = np.array([r[i + 2] for r in intervals])
+
+    np.savez_compressed(path, **columns)
+    return [path]
+
+def export_results(results: List[Tuple[str, List[Metrics]]], path: str) -> List[str]:
+    """Pick the format from the path: *.npz for NumPy, anything else is a CSV prefix."""
+    if path.endswith(".npz"):
+        return export_npz(results, path)
+    return export_csv(results, path)
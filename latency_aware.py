@@ -0,0 +1,309 @@
+from simulator import Node, Message, NodeState
+from typing import List, Dict, Optional, Tuple
+import math
+
+class LatencyAwareNode(Node):
+    """Elects the node that reaches a quorum fastest. Elections work like
+    MultiAttributeNode with a lower quorum RTT winning; a leader hands off to a
+    clearly faster node once it has held leadership for min_tenure."""
+    DEFAULT_TIMEOUTS = {
+        "ok": 0.3,
+        "heartbeat_interval": 0.1,
+        "heartbeat_timeout": 0.4,
+        "probe_interval": 0.2,
+        "rtt_ttl": 3.0,        # Forget RTT samples older than this
+        "min_tenure": 0.5,
+        "handoff_hold": 0.3
+    }
+    RTT_SMOOTHING = 0.25   # EWMA weight of a new RTT sample
+    HANDOFF_MARGIN = 0.2   # A successor's quorum RTT must be this fraction lower
+    BURST_SLACK = 0.5      # Extra fraction of peers a bootstrap probe burst covers
+
+    def __init__(self, node_id: int, total_nodes: int, timeouts: Optional[Dict[str, float]] = None):
+        super().__init__(node_id, total_nodes, timeouts)
+        self.awaiting_ok = False
+        self.ok_timeout = None
+        self.campaign_rtt = math.inf  # Estimate the current campaign was sent with
+        self.heartbeat_timeout = None
+        self.last_heartbeat_sent = 0.0
+        self.last_probe_sent = 0.0
+        self.last_burst_sent = -math.inf
+        self.next_probe_peer = (node_id + 1) % total_nodes
+        # RTTs from HEARTBEAT -> HEARTBEAT_ACK (the leader reports each follower's in
+        # the next heartbeat) and from round-robin PROBEs for the links heartbeats miss
+        self.rtt: Dict[int, Tuple[float, float]] = {}        # peer -> (smoothed RTT, last sample time)
+        # Gossiped on every message; heartbeats carry the leader's whole table
+        self.estimates: Dict[int, Tuple[float, float]] = {}  # node -> (quorum RTT, when learned)
+        self.epoch = 0  # Highest leader epoch seen; a leader yields only to a higher (epoch, id)
+        self.leader_since = 0.0
+        self.handoff_target: Optional[int] = None  # Faster node being watched
+        self.handoff_since = 0.0
+
+    def quorum_rtt(self, current_time: float) -> float:
+        """RTT by which this node hears from a majority (itself included); inf until
+        enough peers are measured."""
+        needed = self.total_nodes // 2  # Peers that make a majority with this node
+        if needed == 0:
+            return 0.0
+        fresh = sorted(srtt for srtt, at in self.rtt.values() if current_time - at <= self.timeouts["rtt_ttl"])
+        return fresh[needed - 1] if len(fresh) >= needed else math.inf
+
+    def _is_better(self, current_time: float, other_rtt: float, other_id: int) -> bool:
+        own = self.quorum_rtt(current_time)
+        if own == math.inf or other_rtt == math.inf:
+            return own < other_rtt
+        # Estimates are noisy, so compare them in buckets HANDOFF_MARGIN wide, then by id
+        return (-self._bucket(own), self.node_id) > (-self._bucket(other_rtt), other_id)
+
+    def _bucket(self, rtt: float) -> int:
+        return math.floor(math.log(max(rtt, 1e-3)) / -math.log(1 - self.HANDOFF_MARGIN))
+
+    def _sample(self, peer: int, rtt: float, current_time: float):
+        previous = self.rtt.get(peer)
+        if previous is not None and current_time - previous[1] <= self.timeouts["rtt_ttl"]:
+            rtt = previous[0] + self.RTT_SMOOTHING * (rtt - previous[0])
+        self.rtt[peer] = (rtt, current_time)
+
+    def _broadcast(self, msg_type: str, data: dict, current_time: float) -> List[Message]:
+        return [Message(from_node=self.node_id, to_node=i, type=msg_type, data=data, timestamp=current_time)
+                for i in range(self.total_nodes) if i != self.node_id]
+
+    def _reply(self, msg: Message, msg_type: str, current_time: float) -> Message:
+        return Message(
+            from_node=self.node_id,
+            to_node=msg.from_node,
+            type=msg_type,
+            data={"sent": msg.data["sent"], "quorum_rtt": self.quorum_rtt(current_time)},
+            timestamp=current_time
+        )
+
+    def _become_leader(self, current_time: float) -> List[Message]:
+        self.state = NodeState.LEADER
+        self.leader_id = self.node_id
+        self.awaiting_ok = False
+        self.epoch += 1
+        self.last_heartbeat_sent = current_time
+        self.leader_since = current_time
+        self.handoff_target = None
+        return self._broadcast("COORDINATOR", {"leader_id": self.node_id, "epoch": self.epoch}, current_time)
+
+    def start_election(self, current_time: float) -> List[Message]:
+        if self.crashed:
+            return []
+        self.state = NodeState.CANDIDATE
+        self.awaiting_ok = True
+        self.ok_timeout = current_time + self.timeouts["ok"]
+        quorum_rtt = self.campaign_rtt = self.quorum_rtt(current_time)
+        responses = self._broadcast("ELECTION", {"quorum_rtt": quorum_rtt}, current_time)
+        responses.extend(self._probe_unmeasured(current_time))
+        return responses
+
+    def receive_message(self, msg: Message, current_time: float) -> List[Message]:
+        responses = []
+        if "quorum_rtt" in msg.data:
+            self.estimates[msg.from_node] = (msg.data["quorum_rtt"], current_time)
+
+        if msg.type == "ELECTION":
+            # Unmeasured nodes can't be compared and never object; measure now so the
+            # next round of this election can be judged
+            responses.extend(self._probe_unmeasured(current_time))
+            if self._is_better(current_time, msg.data["quorum_rtt"], msg.from_node):
+                responses.append(Message(
+                    from_node=self.node_id,
+                    to_node=msg.from_node,
+                    type="OK",
+                    data={},
+                    timestamp=current_time
+                ))
+                # A follower with a leader keeps it; handoffs move leadership to faster nodes
+                if self.state == NodeState.FOLLOWER and self.leader_id is None:
+                    responses.extend(self.start_election(current_time))
+
+        elif msg.type == "OK":
+            self.awaiting_ok = False
+            self.state = NodeState.FOLLOWER
+            self.ok_timeout = None
+
+        elif msg.type in ("COORDINATOR", "HEARTBEAT") and msg.data["epoch"] < self.epoch:
+            if self.state == NodeState.LEADER:
+                # A stale leader; tell it who leads now
+                responses.append(Message(
+                    from_node=self.node_id,
+                    to_node=msg.from_node,
+                    type="COORDINATOR",
+                    data={"leader_id": self.node_id, "epoch": self.epoch},
+                    timestamp=current_time
+                ))
+
+        elif msg.type in ("COORDINATOR", "HEARTBEAT") and self.state == NodeState.LEADER \
+                and msg.data["epoch"] == self.epoch and self.node_id > msg.from_node:
+            # Estimates move, so two nodes can win the same epoch; the higher id keeps it
+            responses.append(Message(
+                from_node=self.node_id,
+                to_node=msg.from_node,
+                type="COORDINATOR",
+                data={"leader_id": self.node_id, "epoch": self.epoch},
+                timestamp=current_time
+            ))
+
+        elif msg.type == "COORDINATOR":
+            self._follow(msg, current_time)
+            self.awaiting_ok = False
+
+        elif msg.type == "TRANSFER":
+            # The leader picked this node as its successor
+            if self.state != NodeState.LEADER:
+                self.epoch = max(self.epoch, msg.data["epoch"])
+                responses.extend(self._become_leader(current_time))
+
+        elif msg.type == "HEARTBEAT":
+            self._follow(msg, current_time)
+            if msg.data["rtt"] is not None:
+                self._sample(msg.from_node, msg.data["rtt"], current_time)
+            for node_id, estimate in msg.data["estimates"].items():
+                if node_id != self.node_id:
+                    self.estimates[node_id] = (estimate, current_time)
+            responses.append(self._reply(msg, "HEARTBEAT_ACK", current_time))
+
+        elif msg.type == "PROBE":
+            responses.append(self._reply(msg, "PROBE_ACK", current_time))
+
+        elif msg.type in ("HEARTBEAT_ACK", "PROBE_ACK"):
+            self._sample(msg.from_node, current_time - msg.data["sent"], current_time)
+            if self.state == NodeState.CANDIDATE and self.awaiting_ok and self.campaign_rtt == math.inf \
+                    and self.quorum_rtt(current_time) < math.inf:
+                # Measured at last; rerun the campaign now rather than at the OK timeout
+                responses.extend(self.start_election(current_time))
+
+        return responses
+
+    def _follow(self, msg: Message, current_time: float):
+        self.leader_id = msg.data["leader_id"]
+        self.epoch = msg.data["epoch"]
+        self.state = NodeState.FOLLOWER
+        self.heartbeat_timeout = current_time + self.timeouts["heartbeat_timeout"]
+
+    def _probe(self, peer: int, current_time: float) -> Message:
+        return Message(from_node=self.node_id, to_node=peer, type="PROBE",
+                       data={"sent": current_time, "quorum_rtt": self.quorum_rtt(current_time)},
+                       timestamp=current_time)
+
+    def _probe_unmeasured(self, current_time: float) -> List[Message]:
+        """While the quorum RTT is unknown, PROBE enough unmeasured peers at once
+        to make a majority, with BURST_SLACK spare for losses, at most once per
+        probe_interval; elections can't wait for round robin."""
+        if self.quorum_rtt(current_time) < math.inf or \
+                current_time - self.last_burst_sent < self.timeouts["probe_interval"]:
+            return []
+        self.last_burst_sent = current_time
+        fresh = [i for i, (_, at) in self.rtt.items() if current_time - at <= self.timeouts["rtt_ttl"]]
+        unmeasured = [(self.node_id + k) % self.total_nodes for k in range(1, self.total_nodes)]
+        unmeasured = [i for i in unmeasured if i not in fresh]
+        count = math.ceil((self.total_nodes // 2 - len(fresh)) * (1 + self.BURST_SLACK))
+        return [self._probe(i, current_time) for i in unmeasured[:count]]
+
+    def _heartbeats(self, current_time: float) -> List[Message]:
+        estimates = {node_id: estimate for node_id, (estimate, at) in self.estimates.items()
+                     if current_time - at <= self.timeouts["rtt_ttl"]}
+        estimates[self.node_id] = self.quorum_rtt(current_time)
+        responses = []
+        for i in range(self.total_nodes):
+            if i != self.node_id:
+                rtt = self.rtt.get(i)
+                responses.append(Message(
+                    from_node=self.node_id,
+                    to_node=i,
+                    type="HEARTBEAT",
+                    data={"leader_id": self.node_id, "epoch": self.epoch, "sent": current_time,
+                          "rtt": rtt[0] if rtt else None, "estimates": estimates},
+                    timestamp=current_time
+                ))
+        return responses
+
+    def _handoff(self, current_time: float) -> List[Message]:
+        """TRANSFER leadership once a live node has been clearly faster for long enough."""
+        if current_time - self.leader_since < self.timeouts["min_tenure"]:
+            return []
+        # Estimates from heartbeat acks; a stale one means the peer may be down
+        live = {node_id: estimate for node_id, (estimate, at) in self.estimates.items()
+                if current_time - at <= self.timeouts["heartbeat_timeout"]}
+        best = min(live, key=lambda i: (live[i], -i), default=None)
+        if best is None or not live[best] < self.quorum_rtt(current_time) * (1 - self.HANDOFF_MARGIN):
+            self.handoff_target = None
+            return []
+        if best != self.handoff_target:
+            self.handoff_target = best
+            self.handoff_since = current_time
+            return []
+        if current_time - self.handoff_since < self.timeouts["handoff_hold"]:
+            return []
+
+        # Step down now so the two never lead at once; if the successor doesn't announce
+        # itself, the follower timeout campaigns to take leadership back (a live successor
+        # answers with OK)
+        self.state = NodeState.FOLLOWER
+        self.leader_id = best
+        self.heartbeat_timeout = current_time + self.timeouts["heartbeat_timeout"]
+        self.handoff_target = None
+        return [Message(from_node=self.node_id, to_node=best, type="TRANSFER",
+                        data={"epoch": self.epoch}, timestamp=current_time)]
+
+    def tick(self, current_time: float) -> List[Message]:
+        responses = []
+
+        if current_time - self.last_probe_sent >= self.timeouts["probe_interval"] and self.total_nodes > 1:
+            self.last_probe_sent = current_time
+            responses.append(self._probe(self.next_probe_peer, current_time))
+            self.next_probe_peer = (self.next_probe_peer + 1) % self.total_nodes
+            if self.next_probe_peer == self.node_id:
+                self.next_probe_peer = (self.next_probe_peer + 1) % self.total_nodes
+
+        if self.state == NodeState.LEADER:
+            if current_time - self.last_heartbeat_sent >= self.timeouts["heartbeat_interval"]:
+                self.last_heartbeat_sent = current_time
+                responses.extend(self._handoff(current_time))
+                responses.extend(self._heartbeats(current_time))
+
+        if self.state == NodeState.FOLLOWER and self.leader_id is not None:
+            if self.heartbeat_timeout and current_time >= self.heartbeat_timeout:
+                self.leader_id = None
+                responses.extend(self.start_election(current_time))
+
+        if self.state == NodeState.CANDIDATE and self.awaiting_ok:
+            if self.ok_timeout and current_time >= self.ok_timeout:
+                if self.quorum_rtt(current_time) == math.inf:
+                    # Nothing to compare yet; keep probing and wait
+                    self.ok_timeout = current_time + self.timeouts["ok"]
+                    responses.extend(self._probe_unmeasured(current_time))
+                elif self.campaign_rtt == math.inf:
+                    # Nobody could judge the unmeasured campaign; run it again
+                    responses.extend(self.start_election(current_time))
+                else:
+                    # No faster node objected
+                    responses.extend(self._become_leader(current_time))
+        return responses
+
+    def restart(self):
+        # Measurements are in memory only
+        super().restart()
+        self.rtt = {}
+        self.estimates = {}
+        self.awaiting_ok = False
+        self.ok_timeout = None
+        self.campaign_rtt = math.inf
+        self.heartbeat_timeout = None
+        self.last_burst_sent = -math.inf
+        self.epoch = 0
+        self.leader_since = 0.0
+        self.handoff_target = None
+        self.handoff_since = 0.0
+
+    def next_wakeup(self) -> float:
+        wakeups = [self.last_probe_sent + self.timeouts["probe_interval"] if self.total_nodes > 1 else float("inf")]
+        if self.state == NodeState.LEADER:
+            wakeups.append(self.last_heartbeat_sent + self.timeouts["heartbeat_interval"])
+        if self.state == NodeState.FOLLOWER and self.leader_id is not None and self.heartbeat_timeout:
+            wakeups.append(self.heartbeat_timeout)
+        if self.state == NodeState.CANDIDATE and self.awaiting_ok and self.ok_timeout:
+            wakeups.append(self.ok_timeout)
+        return min(wakeups)
@@ -2,42 +2,114 @@
 import yaml
 import math
 import statistics
-from simulator import Simulator, Metrics
+from typing import Optional
+from simulator import Simulator, Metrics, ServiceModel, RATE_TOLERANCE
 from bully import BullyNode
 from ring import RingNode
 from raft import RaftNode
 from multi_attribute import MultiAttributeNode
+from latency_aware import LatencyAwareNode
+from export import export_results
+
+ALGORITHMS = [
+    ("Bully", BullyNode),
+    ("Ring", RingNode),
+    ("Raft", RaftNode),
+    ("Multi-Attr", MultiAttributeNode),
+    ("Latency", LatencyAwareNode)
+]
 
 def get_percentile(data, percentile):
     size = len(data)
     return sorted(data)[int(math.ceil((size * percentile) / 100)) - 1]
 
-def run_algorithm(algorithm_name: str, node_class, config: dict) -> Metrics:
+def build_service_model(section: Optional[dict]) -> Optional[ServiceModel]:
+    """ServiceModel from the optional service_model config section (costs in ms)."""
+    if not section:
+        return None
+    return ServiceModel(
+        receive_cost={k: v / 1000.0 for k, v in section.get("receive_cost_ms", {}).items()},
+        send_cost={k: v / 1000.0 for k, v in section.get("send_cost_ms", {}).items()},
+        default_receive_cost=section.get("default_receive_cost_ms", 0.0) / 1000.0,
+        default_send_cost=section.get("default_send_cost_ms", 0.0) / 1000.0,
+        queue_capacity=section.get("queue_capacity"),
+        overflow_policy=section.get("overflow_policy", "tail_drop")
+    )
+
+def build_link_model(config: dict):
+    """NetworkTrace or RegionTopology from the network_trace or wan_topology config
+    section (the trace wins if both are set), or None."""
+    section = config.get("network_trace")
+    if section:
+        from network_trace import NetworkTrace
+        return NetworkTrace(
+            section["path"],
+            trace_start=section.get("trace_start"),
+            speed=section.get("speed", 1.0),
+            lookback=section.get("lookback", 60.0)
+        )
+    section = config.get("wan_topology")
+    if section:
+        from topology import RegionTopology
+        return RegionTopology(section["regions"], section["rtt_ms"], section.get("jitter_ms", 0.0))
+    return None
+
+def algorithm_name(node_class) -> str:
+    for name, cls in ALGORITHMS:
+        if cls is node_class:
+            return name
+    return node_class.__name__
+
+def build_simulator(node_class, config: dict, **node_kwargs) -> Simulator:
+    """Simulator with num_nodes nodes, using per-algorithm timeouts from the config if set.
+    Extra keyword arguments go to every node (e.g. Raft's max_batch)."""
     sim = Simulator(
         latency_ms=config["latency_ms"],
         latency_jitter_ms=config.get("latency_jitter_ms", 0),
-        message_loss_prob=config.get("message_loss_prob", 0.0)
+        message_loss_prob=config.get("message_loss_prob", 0.0),
+        vectorized_ticks=config.get("vectorized_ticks", False),
+        service_model=build_service_model(config.get("service_model")),
+        bandwidth_mbps=config.get("bandwidth_mbps"),
+        link_model=build_link_model(config)
     )
     
+    timeouts = (config.get("timeouts") or {}).get(algorithm_name(node_class))
     for i in range(config["num_nodes"]):
-        node = node_class(i, config["num_nodes"])
+        node = node_class(i, config["num_nodes"], timeouts=timeouts, **node_kwargs)
         sim.nodes.append(node)
-    
+
+    return sim
+
+def fault_schedule(config: dict) -> dict:
+    """Crash, restart and partition arguments for Simulator.run_simulation/start_run."""
     restart_time = config["optional_restart_time"] if config["enable_restart"] else None
     
     partition_start = config.get("partition_start_time") if config.get("enable_partition") else None
     partition_end = config.get("partition_end_time") if config.get("enable_partition") else None
     partition_groups = config.get("partition_groups") if config.get("enable_partition") else None
 
-    metrics = sim.run_simulation(
-        duration=5.0,
-        kill_time=config["leader_kill_time"],
-        restart_time=restart_time,
-        killed_node=None,
-        partition_start=partition_start,
-        partition_end=partition_end,
-        partition_groups=partition_groups
-    )
+    return {
+        "kill_time": config["leader_kill_time"],
+        "restart_time": restart_time,
+        "killed_node": None,
+        "partition_start": partition_start,
+        "partition_end": partition_end,
+        "partition_groups": partition_groups
+    }
+
+def run_algorithm(algorithm_name: str, node_class, config: dict, sim: Optional[Simulator] = None) -> Metrics:
+    """Run one trial. Pass a prebuilt sim to attach tick hooks (e.g. a client workload)
+    first; the caller then closes it."""
+    owned = sim is None
+    if owned:
+        sim = build_simulator(node_class, config)
+    
+    metrics = sim.run_simulation(duration=config.get("duration", 5.0),
+                                 quiescence_window=config.get("quiescence_window"),
+                                 rate_tolerance=config.get("rate_tolerance", RATE_TOLERANCE),
+                                 **fault_schedule(config))
+    if owned:
+        sim.close()
     
     return metrics
 
@@ -49,6 +121,10 @@ def main():
     print("Leader Election Algorithm Comparison")
     print("=" * 60)
     print(f"Setup: {config['num_nodes']} nodes, {config['latency_ms']}ms latency")
+    print(f"Duration {config.get('duration', 5.0)}s", end="")
+    if config.get('quiescence_window') is not None:
+        print(f", stopping early after {config['quiescence_window']}s of stable leadership", end="")
+    print()
     print(f"Leader crash at t={config['leader_kill_time']}s")
     if config['enable_restart']:
         print(f"Leader restart at t={config['optional_restart_time']}s")
@@ -58,19 +134,12 @@ def main():
     print("=" * 60)
     print()
     
-    algorithms = [
-        ("Bully", BullyNode),
-        ("Ring", RingNode),
-        ("Raft", RaftNode),
-        ("Multi-Attr", MultiAttributeNode)
-    ]
-    
     NUM_TRIALS = 5
     print(f"Running {NUM_TRIALS} trials per algorithm for P50/P95 analysis...")
     print()
 
     results = []
-    for name, node_class in algorithms:
+    for name, node_class in ALGORITHMS:
         print(f"Running {name} algorithm...", end="", flush=True)
         trial_metrics = []
         for _ in range(NUM_TRIALS):
@@ -80,14 +149,14 @@ def main():
         results.append((name, trial_metrics))
         print(f" Done")
     
-    print("\n" + "=" * 80)
+    print("\n" + "=" * 110)
     print("RESULTS (P50 / P95)")
-    print("=" * 80)
+    print("=" * 110)
     print()
     
     # Header
-    print(f"{'Algorithm':<10} | {'Election (s)':<18} | {'Re-election (s)':<18} | {'Messages':<15} | {'Success'}")
-    print("-" * 80)
+    print(f"{'Algorithm':<10} | {'Election (s)':<18} | {'Re-election (s)':<18} | {'Messages':<15} | {'KB':<15} | {'Avail (%)':<9} | {'Success'}")
+    print("-" * 110)
     
     final_stats = []
 
@@ -96,7 +165,9 @@ def main():
         elec_times = [m.election_time for m in metrics_list]
         reelec_times = [m.reelection_time for m in metrics_list]
         msgs = [m.messages_sent for m in metrics_list]
+        kbytes = [m.bytes_sent / 1024 for m in metrics_list]
         success_count = sum(1 for m in metrics_list if m.final_leaders == 1)
+        availability = statistics.mean(m.availability for m in metrics_list)
         
         # Calculate stats
         e_p50 = get_percentile(elec_times, 50)
@@ -107,32 +178,45 @@ def main():
         
         m_p50 = get_percentile(msgs, 50)
         m_p95 = get_percentile(msgs, 95)
+
+        b_p50 = get_percentile(kbytes, 50)
+        b_p95 = get_percentile(kbytes, 95)
         
         success_rate = f"{success_count}/{NUM_TRIALS}"
         
         # Store for analysis
         final_stats.append({
             "name": name,
-            "e_p50": e_p50, "r_p50": r_p50, "m_p50": m_p50
+            "e_p50": e_p50, "r_p50": r_p50, "m_p50": m_p50, "b_p50": b_p50,
+            "availability": availability
         })
 
         # Print row
-        print(f"{name:<10} | {e_p50:.3f} / {e_p95:.3f}      | {r_p50:.3f} / {r_p95:.3f}      | {m_p50:<5} / {m_p95:<5} | {success_rate}")
+        print(f"{name:<10} | {e_p50:.3f} / {e_p95:.3f}      | {r_p50:.3f} / {r_p95:.3f}      | {m_p50:<5} / {m_p95:<5} | {b_p50:<6.1f} / {b_p95:<6.1f} | {availability:<9.1f} | {success_rate}")
     
     print()
-    print("=" * 80)
+    print("=" * 110)
     print("ANALYSIS (Based on P50)")
-    print("=" * 80)
+    print("=" * 110)
     
     fastest_election = min(final_stats, key=lambda x: x["e_p50"])
     fastest_reelection = min(final_stats, key=lambda x: x["r_p50"])
     fewest_messages = min(final_stats, key=lambda x: x["m_p50"])
+    fewest_bytes = min(final_stats, key=lambda x: x["b_p50"])
+    most_available = max(final_stats, key=lambda x: x["availability"])
     
     print(f"Fastest election:     {fastest_election['name']} ({fastest_election['e_p50']:.3f}s)")
     print(f"Fastest re-election:  {fastest_reelection['name']} ({fastest_reelection['r_p50']:.3f}s)")
     print(f"Fewest messages:      {fewest_messages['name']} ({fewest_messages['m_p50']} msgs)")
+    print(f"Fewest bytes:         {fewest_bytes['name']} ({fewest_bytes['b_p50']:.1f} KB)")
+    print(f"Most available:       {most_available['name']} ({most_available['availability']:.1f}% single-leader time)")
     print()
 
+    if config.get("export_path"):
+        paths = export_results(results, config["export_path"])
+        print(f"Exported results to: {', '.join(paths)}")
+        print()
+
 if __name__ == "__main__":
     main()
 
@@ -1,10 +1,16 @@
 from simulator import Node, Message, NodeState
-from typing import List
+from typing import List, Dict, Optional
 import random
 
 class MultiAttributeNode(Node):
-    def __init__(self, node_id: int, total_nodes: int):
-        super().__init__(node_id, total_nodes)
+    DEFAULT_TIMEOUTS = {
+        "ok": 0.3,  # Slightly longer timeout for broadcast
+        "heartbeat_interval": 0.1,
+        "heartbeat_timeout": 0.4
+    }
+
+    def __init__(self, node_id: int, total_nodes: int, timeouts: Optional[Dict[str, float]] = None):
+        super().__init__(node_id, total_nodes, timeouts)
         # Simulate dynamic attributes (Paper: Multi-attribute Self-Stabilizing Leader Election)
         self.battery = random.randint(50, 100)
         self.cpu_load = random.randint(0, 60)
@@ -21,7 +27,7 @@ class MultiAttributeNode(Node):
             return []
         self.state = NodeState.CANDIDATE
         self.awaiting_ok = True
-        self.ok_timeout = current_time + 0.3  # Slightly longer timeout for broadcast
+        self.ok_timeout = current_time + self.timeouts["ok"]
         
         messages = []
         # In Multi-attribute, we don't know who has a higher score, so we broadcast to ALL
@@ -73,12 +79,12 @@ class MultiAttributeNode(Node):
             self.leader_id = msg.data["leader_id"]
             self.state = NodeState.FOLLOWER
             self.awaiting_ok = False
-            self.heartbeat_timeout = current_time + 0.4
+            self.heartbeat_timeout = current_time + self.timeouts["heartbeat_timeout"]
 
         elif msg.type == "HEARTBEAT":
             self.leader_id = msg.data["leader_id"]
             self.state = NodeState.FOLLOWER
-            self.heartbeat_timeout = current_time + 0.4
+            self.heartbeat_timeout = current_time + self.timeouts["heartbeat_timeout"]
             
         return responses
 
@@ -87,7 +93,7 @@ class MultiAttributeNode(Node):
         
         # Leader Logic: Send Heartbeats
         if self.state == NodeState.LEADER:
-            if current_time - self.last_heartbeat_sent >= 0.1:
+            if current_time - self.last_heartbeat_sent >= self.timeouts["heartbeat_interval"]:
                 self.last_heartbeat_sent = current_time
                 for i in range(self.total_nodes):
                     if i != self.node_id:
@@ -124,3 +130,13 @@ class MultiAttributeNode(Node):
                             timestamp=current_time
                         ))
         return responses
+
+    def next_wakeup(self) -> float:
+        wakeups = [float("inf")]
+        if self.state == NodeState.LEADER:
+            wakeups.append(self.last_heartbeat_sent + self.timeouts["heartbeat_interval"])
+        if self.state == NodeState.FOLLOWER and self.leader_id is not None and self.heartbeat_timeout:
+            wakeups.append(self.heartbeat_timeout)
+        if self.state == NodeState.CANDIDATE and self.awaiting_ok and self.ok_timeout:
+            wakeups.append(self.ok_timeout)
+        return min(wakeups)
@@ -0,0 +1,203 @@
+import math
+import bisect
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Columns of a trace file; outage is optional (non-zero means the link is down)
+TRACE_COLUMNS = ["time", "src", "dst", "rtt_ms", "loss"]
+
+# Rows read from a memory-mapped .npy per pass, to bound memory
+NPY_CHUNK_ROWS = 65536
+
+# Trace seconds of superseded per-link conditions kept for messages that depart
+# later than they are sent, e.g. queued behind a bandwidth limit
+TRACE_HISTORY = 10.0
+
+TraceRow = Tuple[float, int, int, float, float, bool]  # time, src, dst, rtt_ms, loss, outage
+
+class _CsvTrace:
+    """Streams rows of a time-sorted CSV with a header line. Only the byte offset
+    of the next unread row is kept, so the file is never loaded whole."""
+
+    def __init__(self, path: str, offset: Optional[int] = None):
+        self.path = path
+        self.file = open(path, "rb")
+        header = [name.strip() for name in self.file.readline().decode().split(",")]
+        missing = [c for c in TRACE_COLUMNS if c not in header]
+        if missing:
+            raise ValueError(f"{path}: missing trace columns {missing}")
+        self.columns = {name: i for i, name in enumerate(header)}
+        self.width = len(header)
+        self.has_outage = "outage" in self.columns
+        if offset is not None:
+            self.file.seek(offset)
+        self.pending = None  # Row read but not yet due
+        self.offset = self.file.tell()  # Start of the pending row, or of the next line
+
+    def _read(self) -> Optional[TraceRow]:
+        while True:
+            self.offset = self.file.tell()
+            line = self.file.readline()
+            if not line:
+                return None
+            if not line.strip():
+                continue
+            fields = line.decode().split(",")
+            if len(fields) != self.width:
+                raise ValueError(f"{self.path}: row at byte {self.offset} has {len(fields)} fields, "
+                                 f"header has {self.width}")
+            c = self.columns
+            rtt = fields[c["rtt_ms"]].strip()
+            loss = fields[c["loss"]].strip()
+            outage = self.has_outage and fields[c["outage"]].strip() not in ("", "0", "0.0", "false", "False")
+            return (float(fields[c["time"]]), int(fields[c["src"]]), int(fields[c["dst"]]),
+                    float(rtt) if rtt else math.nan, float(loss) if loss else 0.0, outage)
+
+    def first_time(self) -> float:
+        if self.pending is None:
+            self.pending = self._read()
+        return self.pending[0] if self.pending is not None else 0.0
+
+    def read_until(self, trace_time: float) -> Iterator[TraceRow]:
+        while True:
+            if self.pending is None:
+                self.pending = self._read()
+                if self.pending is None:
+                    return
+            if self.pending[0] > trace_time:
+                return
+            yield self.pending
+            self._consume()
+
+    def skip_until(self, trace_time: float):
+        """Discard rows before trace_time without applying them."""
+        while self.first_time() < trace_time and self.pending is not None:
+            self._consume()
+
+    def _consume(self):
+        self.pending = None
+        self.offset = self.file.tell()
+
+    def copy(self) -> "_CsvTrace":
+        return _CsvTrace(self.path, self.offset)
+
+    def close(self):
+        self.file.close()
+
+class _NpyTrace:
+    """Memory-mapped structured .npy with the trace columns as fields, sorted by time."""
+
+    def __init__(self, path: str, position: int = 0):
+        self.path = path
+        self.data = np.load(path, mmap_mode="r")
+        names = self.data.dtype.names or ()
+        missing = [c for c in TRACE_COLUMNS if c not in names]
+        if missing:
+            raise ValueError(f"{path}: missing trace fields {missing}")
+        self.has_outage = "outage" in names
+        self.times = self.data["time"]
+        self.position = position
+
+    def first_time(self) -> float:
+        return float(self.times[self.position]) if self.position < len(self.times) else 0.0
+
+    def read_until(self, trace_time: float) -> Iterator[TraceRow]:
+        end = int(np.searchsorted(self.times, trace_time, side="right"))
+        while self.position < end:
+            chunk = self.data[self.position:min(end, self.position + NPY_CHUNK_ROWS)]
+            outage = chunk["outage"].astype(bool).tolist() if self.has_outage else [False] * len(chunk)
+            self.position += len(chunk)
+            yield from zip(chunk["time"].tolist(), chunk["src"].tolist(), chunk["dst"].tolist(),
+                           chunk["rtt_ms"].tolist(), chunk["loss"].tolist(), outage)
+
+    def skip_until(self, trace_time: float):
+        self.position = max(self.position, int(np.searchsorted(self.times, trace_time, side="left")))
+
+    def copy(self) -> "_NpyTrace":
+        return _NpyTrace(self.path, self.position)
+
+    def close(self):
+        # numpy has no public close for a memmap; the mapping goes with its last reference
+        self.data = self.times = None
+
+class NetworkTrace:
+    """Replays recorded per-link RTT, loss and outages as link conditions.
+
+    A trace is a time-sorted CSV (header: time,src,dst,rtt_ms,loss[,outage]) or a
+    structured .npy with the same fields, which is memory-mapped. Each row sets a
+    link's conditions from its time until the link's next row; rtt is halved into
+    a one-way delay and a row with outage set loses every message. Rows apply to
+    both directions unless the reverse link has its own rows.
+
+    Simulated time t maps to trace time trace_start + t * speed (trace_start
+    defaults to the first row). Only rows from lookback trace-seconds before
+    trace_start onward are applied, and rows are read as the clock advances, so
+    memory stays proportional to the number of links. Links with no sample yet,
+    and client traffic, fall back to the simulator's synthetic model.
+
+    Each copy holds an open file or mapping; close() it (or use it as a context
+    manager) when done.
+    """
+
+    def __init__(self, path: str, trace_start: Optional[float] = None, speed: float = 1.0,
+                 lookback: float = 60.0):
+        self.path = path
+        self.reader = _NpyTrace(path) if path.endswith(".npy") else _CsvTrace(path)
+        self.trace_start = trace_start if trace_start is not None else self.reader.first_time()
+        self.speed = speed
+        self.reader.skip_until(self.trace_start - lookback)
+        # link -> [(trace time, delay s, loss)], oldest first, back to TRACE_HISTORY
+        self.links: Dict[Tuple[int, int], List[Tuple[float, Optional[float], float]]] = {}
+        self.trace_time = -math.inf
+
+    def __deepcopy__(self, memo):
+        # Branching a run (rare_event) reopens the file at the same position
+        clone = NetworkTrace.__new__(NetworkTrace)
+        clone.path = self.path
+        clone.reader = self.reader.copy()
+        clone.trace_start = self.trace_start
+        clone.speed = self.speed
+        clone.links = {link: list(history) for link, history in self.links.items()}
+        clone.trace_time = self.trace_time
+        memo[id(self)] = clone
+        return clone
+
+    def close(self):
+        self.reader.close()
+
+    def __enter__(self) -> "NetworkTrace":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _advance(self, sim_time: float):
+        trace_time = self.trace_start + sim_time * self.speed
+        if trace_time <= self.trace_time:
+            return
+        self.trace_time = trace_time
+        for row_time, src, dst, rtt_ms, loss, outage in self.reader.read_until(trace_time):
+            history = self.links.setdefault((src, dst), [])
+            previous = history[-1][1] if history else None
+            delay = rtt_ms / 2000.0 if not math.isnan(rtt_ms) else previous
+            history.append((row_time, delay, 1.0 if outage else loss))
+            while len(history) > 1 and history[1][0] <= trace_time - TRACE_HISTORY:
+                del history[0]
+
+    def _lookup(self, link: Tuple[Optional[int], Optional[int]],
+                trace_time: float) -> Optional[Tuple[Optional[float], float]]:
+        history = self.links.get(link)
+        if not history:
+            return None
+        i = bisect.bisect_right(history, trace_time, key=lambda entry: entry[0]) - 1
+        return history[i][1:] if i >= 0 else None
+
+    def conditions(self, from_node: Optional[int], to_node: Optional[int],
+                   sim_time: float) -> Optional[Tuple[Optional[float], float]]:
+        """(one-way delay or None, loss probability) for the link at sim_time, or
+        None if the trace has nothing for it by then. sim_time may be later than
+        earlier calls (a queued departure) and earlier again afterwards."""
+        self._advance(sim_time)
+        trace_time = self.trace_start + sim_time * self.speed
+        found = self._lookup((from_node, to_node), trace_time)
+        return found if found is not None else self._lookup((to_node, from_node), trace_time)
@@ -0,0 +1,38 @@
+import numpy as np
+from typing import List
+from simulator import Node, NodeState
+
+# Wake a node slightly early so float rounding never makes it miss a timer;
+# an early tick() is harmless, it just returns [].
+WAKEUP_SLACK = 1e-9
+
+class NodeTimerStore:
+    """Struct-of-arrays view of per-node timer state.
+
+    Each node's earliest pending deadline (see Node.next_wakeup) is kept in a
+    NumPy array, so finding the nodes whose timers fired is one vectorized
+    comparison instead of a tick() call on every node. The simulator must call
+    refresh() after any call that can change a node's state.
+    """
+
+    def __init__(self, nodes: List[Node]):
+        n = len(nodes)
+        self.wakeup = np.zeros(n)
+        self.alive = np.ones(n, dtype=bool)
+        self.leader = np.zeros(n, dtype=bool)
+        for node in nodes:
+            self.refresh(node)
+
+    def refresh(self, node: Node):
+        i = node.node_id
+        self.alive[i] = not node.crashed
+        self.leader[i] = node.state == NodeState.LEADER
+        self.wakeup[i] = node.next_wakeup() - WAKEUP_SLACK
+
+    def due(self, current_time: float) -> np.ndarray:
+        """Ids of live nodes with at least one timer at or before current_time."""
+        return np.flatnonzero(self.alive & (self.wakeup <= current_time))
+
+    def leaders(self) -> np.ndarray:
+        """Ids of live nodes currently in the LEADER state."""
+        return np.flatnonzero(self.alive & self.leader)
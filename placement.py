@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+import yaml
+import random
+import statistics
+from typing import Optional
+from simulator import Metrics
+from topology import RegionTopology
+from main import ALGORITHMS, run_algorithm
+
+# Used when config.yaml has no wan_topology section (10 nodes, four regions)
+DEFAULT_TOPOLOGY = {
+    "regions": [[0, 1, 2], [3, 4, 5], [6, 7], [8, 9]],
+    "rtt_ms": [[2, 40, 100, 200],
+               [40, 2, 70, 160],
+               [100, 70, 2, 150],
+               [200, 160, 150, 2]],
+    "jitter_ms": 5
+}
+
+def leader_quorum_rtt(metrics: Metrics, topology: RegionTopology, num_nodes: int,
+                      start: float = 0.0) -> Optional[float]:
+    """Time-weighted nominal quorum RTT of the single leader from start onward:
+    the floor on its heartbeat round and commit latency."""
+    weighted = led = 0.0
+    for iv in metrics.timeline:
+        span = iv.end - max(iv.start, start)
+        if iv.leader_count != 1 or span <= 0:
+            continue
+        quorum_rtt = topology.quorum_rtt(iv.leader_id, list(range(num_nodes)))
+        if quorum_rtt is None:
+            raise ValueError(f"node {iv.leader_id} or one of its peers is in no wan_topology region")
+        weighted += span * quorum_rtt
+        led += span
+    return weighted / led if led > 0 else None
+
+def main():
+    with open("config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+
+    settings = {"trials": 5, "seed": 0}
+    settings.update(config.get("placement", {}))
+    section = config.get("wan_topology") or DEFAULT_TOPOLOGY
+    topology = RegionTopology(section["regions"], section["rtt_ms"], section.get("jitter_ms", 0.0))
+    base = dict(config, wan_topology=section)
+    n = config["num_nodes"]
+    unplaced = [i for i in range(n) if i not in topology.region_of]
+    if unplaced:
+        raise ValueError(f"wan_topology must place every node; {unplaced} are in no region "
+                         f"(num_nodes is {n})")
+    kill_time = config["leader_kill_time"]
+
+    print("=" * 96)
+    print("Leader Placement on a WAN Topology")
+    print("=" * 96)
+    print(f"Regions: {section['regions']}, RTT (ms): {section['rtt_ms']}")
+    print(f"Best possible quorum RTT: {min(topology.quorum_rtt(i, list(range(n))) for i in range(n)) * 1000:.0f}ms")
+    print("=" * 96)
+    print()
+    print(f"{'Algorithm':<10} | {'Quorum RTT (ms)':>15} | {'After crash (ms)':>16} | {'Leader changes':>14} | "
+          f"{'Avail (%)':>9} | {'Messages':>8}")
+    print("-" * 96)
+
+    for name, node_class in ALGORITHMS:
+        random.seed(settings["seed"])
+        trials = [run_algorithm(name, node_class, base) for _ in range(settings["trials"])]
+        overall = [q for q in (leader_quorum_rtt(m, topology, n) for m in trials) if q is not None]
+        after = [q for q in (leader_quorum_rtt(m, topology, n, kill_time) for m in trials) if q is not None]
+        overall_ms = f"{statistics.mean(overall) * 1000:.0f}" if overall else "n/a"
+        after_ms = f"{statistics.mean(after) * 1000:.0f}" if after else "n/a"
+        print(f"{name:<10} | {overall_ms:>15} | {after_ms:>16} | "
+              f"{statistics.mean(m.leader_changes for m in trials):14.1f} | "
+              f"{statistics.mean(m.availability for m in trials):9.1f} | "
+              f"{statistics.mean(m.messages_sent for m in trials):8.0f}")
+    print()
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,54 @@
 from simulator import Node, Message, NodeState
-from typing import List
+from typing import List, Any, Dict, Optional
 import random
 
 class RaftNode(Node):
-    def __init__(self, node_id: int, total_nodes: int):
-        super().__init__(node_id, total_nodes)
+    # The election window stays well above heartbeat_interval plus a round trip, so a
+    # single lost heartbeat does not make a follower stand against a live leader
+    DEFAULT_TIMEOUTS = {
+        "election_min": 0.3,
+        "election_max": 0.6,
+        "heartbeat_interval": 0.1,
+        "retransmit": 0.3
+    }
+
+    def __init__(self, node_id: int, total_nodes: int, max_batch: int = 64, max_inflight: int = 1,
+                 timeouts: Optional[Dict[str, float]] = None):
+        super().__init__(node_id, total_nodes, timeouts)
         self.current_term = 0
         self.voted_for = None
         self.votes_received = 0
         self.election_timeout = None
         self.heartbeat_timeout = None
-        
+
+        # Replicated log. Entry i (1-based) is self.log[i - 1] = {"term": ..., "command": ...}
+        self.log: List[dict] = []
+        self.commit_index = 0
+
+        # AppendEntries tuning: entries per message, and outstanding messages per follower
+        self.max_batch = max_batch
+        self.max_inflight = max_inflight
+
+        # Leader-only replication state, keyed by follower id
+        self.next_index = {}
+        self.match_index = {}
+        self.inflight = {}
+        self.last_ack = {}
+        # Log index of each client command in this node's log
+        self.command_index = {}
+
+    def _election_delay(self) -> float:
+        return random.uniform(self.timeouts["election_min"], self.timeouts["election_max"])
+
+    def last_log_index(self) -> int:
+        return len(self.log)
+
+    def last_log_term(self) -> int:
+        return self.log[-1]["term"] if self.log else 0
+
+    def _term_at(self, index: int) -> int:
+        return self.log[index - 1]["term"] if index > 0 else 0
+
     def start_election(self, current_time: float) -> List[Message]:
         if self.crashed:
             return []
@@ -18,8 +56,8 @@ class RaftNode(Node):
         self.state = NodeState.CANDIDATE
         self.voted_for = self.node_id
         self.votes_received = 1
-        self.election_timeout = current_time + random.uniform(0.15, 0.3)
-        
+        self.election_timeout = current_time + self._election_delay()
+
         messages = []
         for i in range(self.total_nodes):
             if i != self.node_id:
@@ -27,30 +65,125 @@ class RaftNode(Node):
                     from_node=self.node_id,
                     to_node=i,
                     type="REQUEST_VOTE",
-                    data={"term": self.current_term, "candidate_id": self.node_id},
+                    data={
+                        "term": self.current_term,
+                        "candidate_id": self.node_id,
+                        "last_log_index": self.last_log_index(),
+                        "last_log_term": self.last_log_term()
+                    },
                     timestamp=current_time
                 ))
         return messages
-        
+
+    def client_request(self, command: Any, current_time: float) -> List[Message]:
+        """Append a client command to the leader's log and replicate it.
+        Non-leaders ignore the request, and a command already in the log is not
+        appended again; callers should check state first."""
+        if self.crashed or self.state != NodeState.LEADER:
+            return []
+        if command is not None and command in self.command_index:
+            return []
+        self._append({"term": self.current_term, "command": command})
+        self._advance_commit()
+        responses = []
+        for i in range(self.total_nodes):
+            if i != self.node_id:
+                responses.extend(self._replicate(i, current_time))
+        return responses
+
+    def is_committed(self, command: Any) -> bool:
+        index = self.command_index.get(command)
+        return index is not None and index <= self.commit_index
+
+    def _append(self, entry: dict):
+        self.log.append(entry)
+        if entry["command"] is not None:
+            self.command_index[entry["command"]] = self.last_log_index()
+
+    def _truncate(self, index: int):
+        """Drop log entries from index on, e.g. ones a new leader overwrote."""
+        for entry in self.log[index - 1:]:
+            self.command_index.pop(entry["command"], None)
+        del self.log[index - 1:]
+
+    def _become_leader(self, current_time: float) -> List[Message]:
+        self.state = NodeState.LEADER
+        self.leader_id = self.node_id
+        self.heartbeat_timeout = current_time + self.timeouts["heartbeat_interval"]
+        for i in range(self.total_nodes):
+            if i != self.node_id:
+                self.next_index[i] = self.last_log_index() + 1
+                self.match_index[i] = 0
+                self.inflight[i] = 0
+                self.last_ack[i] = current_time
+        # A no-op entry from the new term lets entries from earlier terms commit
+        return self.client_request(None, current_time)
+
+    def _step_down(self, term: int, current_time: float, reset_timer: bool = True):
+        # A leader has no running election timer, so it always gets a fresh one
+        if reset_timer or self.state == NodeState.LEADER or self.election_timeout is None:
+            self.election_timeout = current_time + self._election_delay()
+        self.current_term = term
+        self.state = NodeState.FOLLOWER
+        self.voted_for = None
+        self.leader_id = None
+
+    def _append_entries(self, follower: int, prev_index: int, entries: List[dict], current_time: float) -> Message:
+        return Message(
+            from_node=self.node_id,
+            to_node=follower,
+            type="HEARTBEAT",
+            data={
+                "term": self.current_term,
+                "leader_id": self.node_id,
+                "prev_log_index": prev_index,
+                "prev_log_term": self._term_at(prev_index),
+                "entries": entries,
+                "leader_commit": self.commit_index
+            },
+            timestamp=current_time
+        )
+
+    def _replicate(self, follower: int, current_time: float) -> List[Message]:
+        """Send as many pipelined batches to a follower as the in-flight limit allows."""
+        messages = []
+        while self.inflight[follower] < self.max_inflight and self.next_index[follower] <= self.last_log_index():
+            start = self.next_index[follower]
+            entries = self.log[start - 1:start - 1 + self.max_batch]
+            messages.append(self._append_entries(follower, start - 1, entries, current_time))
+            self.next_index[follower] = start + len(entries)
+            self.inflight[follower] += 1
+        return messages
+
+    def _advance_commit(self):
+        matches = sorted(list(self.match_index.values()) + [self.last_log_index()], reverse=True)
+        majority_index = matches[self.total_nodes // 2]
+        # Only entries from the current term are committed by counting replicas
+        if majority_index > self.commit_index and self._term_at(majority_index) == self.current_term:
+            self.commit_index = majority_index
+
     def receive_message(self, msg: Message, current_time: float) -> List[Message]:
         responses = []
-        
+
         if msg.type == "REQUEST_VOTE":
             term = msg.data["term"]
             candidate_id = msg.data["candidate_id"]
-            
+
             if term > self.current_term:
-                self.current_term = term
-                self.state = NodeState.FOLLOWER
-                self.voted_for = None
-                self.leader_id = None
-                
+                # Only a granted vote resets the timer; otherwise a candidate with a
+                # stale log would keep up-to-date nodes from ever standing
+                self._step_down(term, current_time, reset_timer=False)
+
+            # Candidate's log must be at least as up-to-date as ours
+            log_ok = (msg.data["last_log_term"], msg.data["last_log_index"]) >= (self.last_log_term(), self.last_log_index())
+
             vote_granted = False
-            if term >= self.current_term and (self.voted_for is None or self.voted_for == candidate_id):
+            if term >= self.current_term and log_ok and (self.voted_for is None or self.voted_for == candidate_id):
                 vote_granted = True
                 self.voted_for = candidate_id
                 self.current_term = term
-                
+                self.election_timeout = current_time + self._election_delay()
+
             responses.append(Message(
                 from_node=self.node_id,
                 to_node=candidate_id,
@@ -58,54 +191,134 @@ class RaftNode(Node):
                 data={"term": self.current_term, "vote_granted": vote_granted},
                 timestamp=current_time
             ))
-            
+
         elif msg.type == "VOTE_RESPONSE":
-            if self.state == NodeState.CANDIDATE and msg.data["term"] == self.current_term:
+            if msg.data["term"] > self.current_term:
+                self._step_down(msg.data["term"], current_time)
+            elif self.state == NodeState.CANDIDATE and msg.data["term"] == self.current_term:
                 if msg.data["vote_granted"]:
                     self.votes_received += 1
                     if self.votes_received > self.total_nodes // 2:
-                        self.state = NodeState.LEADER
-                        self.leader_id = self.node_id
-                        self.heartbeat_timeout = current_time + 0.1
-                        for i in range(self.total_nodes):
-                            if i != self.node_id:
-                                responses.append(Message(
-                                    from_node=self.node_id,
-                                    to_node=i,
-                                    type="HEARTBEAT",
-                                    data={"term": self.current_term, "leader_id": self.node_id},
-                                    timestamp=current_time
-                                ))
-                                
+                        responses.extend(self._become_leader(current_time))
+
         elif msg.type == "HEARTBEAT":
             term = msg.data["term"]
-            if term >= self.current_term:
-                self.current_term = term
-                self.state = NodeState.FOLLOWER
-                self.leader_id = msg.data["leader_id"]
+            if term < self.current_term:
+                # Stale leader; tell it about the newer term
+                responses.append(Message(
+                    from_node=self.node_id,
+                    to_node=msg.from_node,
+                    type="APPEND_RESPONSE",
+                    data={"term": self.current_term, "success": False, "match_index": 0},
+                    timestamp=current_time
+                ))
+                return responses
+
+            if term > self.current_term:
                 self.voted_for = None
-                self.election_timeout = current_time + random.uniform(0.15, 0.3)
-                        
+            self.current_term = term
+            self.state = NodeState.FOLLOWER
+            self.leader_id = msg.data["leader_id"]
+            self.election_timeout = current_time + self._election_delay()
+
+            prev_index = msg.data["prev_log_index"]
+            entries = msg.data["entries"]
+            if prev_index > self.last_log_index() or self._term_at(prev_index) != msg.data["prev_log_term"]:
+                # Log doesn't match; hint where the leader should back up to
+                responses.append(Message(
+                    from_node=self.node_id,
+                    to_node=msg.from_node,
+                    type="APPEND_RESPONSE",
+                    data={"term": self.current_term, "success": False,
+                          "match_index": min(prev_index - 1, self.last_log_index())},
+                    timestamp=current_time
+                ))
+                return responses
+
+            for offset, entry in enumerate(entries):
+                index = prev_index + offset + 1
+                if index <= self.last_log_index():
+                    if self._term_at(index) == entry["term"]:
+                        continue
+                    self._truncate(index)
+                self._append(entry)
+
+            last_new_index = prev_index + len(entries)
+            if msg.data["leader_commit"] > self.commit_index:
+                self.commit_index = max(self.commit_index, min(msg.data["leader_commit"], last_new_index))
+
+            # Plain heartbeats are matched by construction and need no reply
+            if entries:
+                responses.append(Message(
+                    from_node=self.node_id,
+                    to_node=msg.from_node,
+                    type="APPEND_RESPONSE",
+                    data={"term": self.current_term, "success": True, "match_index": last_new_index},
+                    timestamp=current_time
+                ))
+
+        elif msg.type == "APPEND_RESPONSE":
+            if msg.data["term"] > self.current_term:
+                self._step_down(msg.data["term"], current_time)
+            elif self.state == NodeState.LEADER and msg.data["term"] == self.current_term:
+                follower = msg.from_node
+                self.last_ack[follower] = current_time
+                if msg.data["success"]:
+                    self.inflight[follower] = max(0, self.inflight[follower] - 1)
+                    if msg.data["match_index"] > self.match_index[follower]:
+                        self.match_index[follower] = msg.data["match_index"]
+                        self._advance_commit()
+                else:
+                    # Back up and restart the pipeline from the follower's hint
+                    self.inflight[follower] = 0
+                    self.next_index[follower] = max(self.match_index[follower] + 1,
+                                                    min(self.next_index[follower], msg.data["match_index"] + 1))
+                responses.extend(self._replicate(follower, current_time))
+
         return responses
 
     def tick(self, current_time: float) -> List[Message]:
         responses = []
-        if self.state == NodeState.CANDIDATE and self.election_timeout:
+        if self.state in (NodeState.FOLLOWER, NodeState.CANDIDATE) and self.election_timeout:
             if current_time >= self.election_timeout:
                 msgs = self.start_election(current_time)
                 responses.extend(msgs)
-                        
+
         if self.state == NodeState.LEADER and self.heartbeat_timeout:
             if current_time >= self.heartbeat_timeout:
-                self.heartbeat_timeout = current_time + 0.1
+                self.heartbeat_timeout = current_time + self.timeouts["heartbeat_interval"]
                 for i in range(self.total_nodes):
-                    if i != self.node_id:
-                        responses.append(Message(
-                            from_node=self.node_id,
-                            to_node=i,
-                            type="HEARTBEAT",
-                            data={"term": self.current_term, "leader_id": self.node_id},
-                            timestamp=current_time
-                        ))
+                    if i == self.node_id:
+                        continue
+                    if self.inflight[i] > 0 and current_time - self.last_ack[i] >= self.timeouts["retransmit"]:
+                        # Outstanding batches were lost; resend from the last known match
+                        self.inflight[i] = 0
+                        self.next_index[i] = self.match_index[i] + 1
+                        self.last_ack[i] = current_time
+                    msgs = self._replicate(i, current_time)
+                    if not msgs:
+                        # Empty AppendEntries anchored at a known match never fails the log check
+                        msgs = [self._append_entries(i, self.match_index[i], [], current_time)]
+                    responses.extend(msgs)
         return responses
 
+    def restart(self):
+        # current_term, voted_for and the log (with its command_index) are persistent;
+        # everything else is volatile
+        super().restart()
+        self.commit_index = 0
+        self.votes_received = 0
+        self.election_timeout = None
+        self.heartbeat_timeout = None
+        self.next_index = {}
+        self.match_index = {}
+        self.inflight = {}
+        self.last_ack = {}
+
+    def next_wakeup(self) -> float:
+        wakeups = [float("inf")]
+        if self.state in (NodeState.FOLLOWER, NodeState.CANDIDATE) and self.election_timeout:
+            wakeups.append(self.election_timeout)
+        if self.state == NodeState.LEADER and self.heartbeat_timeout:
+            wakeups.append(self.heartbeat_timeout)
+        return min(wakeups)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+import yaml
+import random
+from simulator import Simulator, NodeState
+from raft import RaftNode
+from main import get_percentile, build_simulator, fault_schedule
+
+# (label, max_batch, max_inflight)
+REPLICATION_SETTINGS = [
+    ("unbatched", 1, 1),
+    ("batched", 64, 1),
+    ("pipelined", 64, 4),
+]
+
+class CommitTracker:
+    """Submits client commands to the current leader at a fixed rate and records
+    when each one first shows up as committed on any node."""
+
+    def __init__(self, sim: Simulator, client_rate: float):
+        self.sim = sim
+        self.interval = 1.0 / client_rate
+        self.next_submit = 0.0
+        self.next_id = 0
+        self.submit_time = {}
+        self.pending = {}  # command id -> (leader id, term) of the last attempt (None if never sent)
+        self.commit_time = {}
+        self.scanned = {}
+
+    def __call__(self, current_time: float):
+        leader = self._leader()
+
+        while self.next_submit <= current_time:
+            self.submit_time[self.next_id] = self.next_submit
+            self.pending[self.next_id] = None
+            self.next_id += 1
+            self.next_submit += self.interval
+
+        if leader is not None:
+            # New commands, plus uncommitted ones last sent to an earlier leader (which
+            # may have crashed with them); the leader skips any it already holds
+            attempt = (leader.node_id, leader.current_term)
+            for cmd_id, last in self.pending.items():
+                if last != attempt or cmd_id not in leader.command_index:
+                    self.pending[cmd_id] = attempt
+                    for msg in leader.client_request(cmd_id, current_time):
+                        self.sim.send_message(msg)
+            self.sim.refresh_node(leader)
+
+        for node in self.sim.nodes:
+            start = self.scanned.get(node.node_id, 0)
+            for entry in node.log[start:node.commit_index]:
+                if entry["command"] is not None:
+                    self.commit_time.setdefault(entry["command"], current_time)
+                    self.pending.pop(entry["command"], None)
+            self.scanned[node.node_id] = max(start, node.commit_index)
+
+    def _leader(self):
+        leaders = [n for n in self.sim.nodes if not n.crashed and n.state == NodeState.LEADER]
+        return max(leaders, key=lambda n: n.current_term) if leaders else None
+
+    def window_stats(self, start: float, end: float):
+        """Throughput and latency for commands submitted in [start, end)."""
+        latencies = [self.commit_time[i] - t for i, t in self.submit_time.items()
+                     if start <= t < end and i in self.commit_time]
+        commits = sum(1 for t in self.commit_time.values() if start <= t < end)
+        throughput = commits / (end - start) if end > start else 0.0
+        if not latencies:
+            return throughput, None, None, None
+        return (throughput, get_percentile(latencies, 50),
+                get_percentile(latencies, 95), get_percentile(latencies, 99))
+
+def run_benchmark(config: dict, max_batch: int, max_inflight: int, bench: dict) -> CommitTracker:
+    """One benchmark run under the same network, service model and faults as main.py."""
+    sim = build_simulator(RaftNode, config, max_batch=max_batch, max_inflight=max_inflight)
+
+    tracker = CommitTracker(sim, bench["client_rate"])
+    sim.tick_hooks.append(tracker)
+
+    sim.run_simulation(duration=bench["duration"], **fault_schedule(config))
+    sim.close()
+    return tracker
+
+def format_ms(value) -> str:
+    return f"{value * 1000:7.1f}" if value is not None else "    n/a"
+
+def main():
+    with open("config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+
+    bench = {"client_rate": 200.0, "duration": config.get("duration", 5.0), "seed": 0}
+    bench.update(config.get("raft_benchmark", {}))
+    kill_time = config["leader_kill_time"]
+
+    print("=" * 80)
+    print("Raft Log Replication Benchmark")
+    print("=" * 80)
+    print(f"Setup: {config['num_nodes']} nodes, {config['latency_ms']}ms latency, "
+          f"{bench['client_rate']:.0f} req/s for {bench['duration']}s")
+    print(f"Leader crash at t={kill_time}s")
+    if config.get('enable_partition'):
+        print(f"Partition at t={config['partition_start_time']}s - {config['partition_end_time']}s")
+    print("=" * 80)
+    print()
+    print(f"{'Setting':<10} | {'Window':<12} | {'Commits/s':>9} | {'P50 (ms)':>8} | {'P95 (ms)':>8} | {'P99 (ms)':>8}")
+    print("-" * 80)
+
+    for label, max_batch, max_inflight in REPLICATION_SETTINGS:
+        random.seed(bench["seed"])
+        tracker = run_benchmark(config, max_batch, max_inflight, bench)
+        windows = [("before crash", 0.0, kill_time), ("after crash", kill_time, bench["duration"])]
+        for window, start, end in windows:
+            throughput, p50, p95, p99 = tracker.window_stats(start, end)
+            print(f"{label:<10} | {window:<12} | {throughput:9.1f} | {format_ms(p50):>8} | {format_ms(p95):>8} | {format_ms(p99):>8}")
+    print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+import yaml
+import copy
+import math
+import random
+from dataclasses import dataclass
+from typing import List, Tuple, Optional
+from simulator import Simulator, SimulationRun, NodeState
+from main import ALGORITHMS, build_simulator, fault_schedule
+
+@dataclass
+class RareEventEstimate:
+    roots: int
+    probability: float          # P(final_leaders != 1)
+    ci_low: float
+    ci_high: float
+    p_no_leader: float
+    p_split_brain: float
+    simulated_seconds: float    # Total simulated time over all branches
+    total_weight: float         # Summed leaf weight; equals roots without roulette, in expectation with it
+    # Plain Monte Carlo trials needed for the same variance (None if nothing was observed)
+    equivalent_mc_trials: Optional[float]
+
+def is_risky(sim: Simulator, run: SimulationRun, settle_time: float) -> bool:
+    """A state is risky if it doesn't have exactly one leader, only just got one,
+    or some live node is campaigning."""
+    timeline = run.metrics.timeline
+    if not timeline or timeline[-1].leader_count != 1:
+        return True
+    if sim.current_time - timeline[-1].start < settle_time:
+        return True
+    return any(n.state == NodeState.CANDIDATE for n in sim.nodes if not n.crashed)
+
+def _advance(sim: Simulator, run: SimulationRun, until: float):
+    while sim.current_time < until:
+        sim.step(run)
+
+def run_root(node_class, config: dict, duration: float, checkpoints: List[float],
+             split_factor: int, survival_prob: float, settle_time: float,
+             max_branches: int) -> Tuple[float, float, float, float]:
+    """Run one root trajectory with splitting and Russian roulette.
+
+    At each checkpoint a risky branch is cloned into split_factor copies that share
+    its weight. At the first checkpoint only, a settled branch survives with
+    survival_prob at weight 1/survival_prob; repeating the roulette would compound
+    weights into a heavy tail. Either way the expected total weight is unchanged,
+    so the weighted failure count of the leaves is an unbiased estimate for this root.
+    Returns (weighted no-leader, weighted split-brain, total leaf weight, simulated seconds).
+    """
+    sim = build_simulator(node_class, config)
+    run = sim.start_run(duration, **fault_schedule(config))
+    branches = [(sim, run, 1.0)]
+    simulated = 0.0
+
+    for level, checkpoint in enumerate(checkpoints):
+        next_branches = []
+        for sim, run, weight in branches:
+            start = sim.current_time
+            _advance(sim, run, checkpoint)
+            simulated += sim.current_time - start
+            if is_risky(sim, run, settle_time):
+                copies = split_factor if len(next_branches) + split_factor <= max_branches else 1
+                next_branches.append((sim, run, weight / copies))
+                for _ in range(copies - 1):
+                    clone_sim, clone_run = copy.deepcopy((sim, run))
+                    next_branches.append((clone_sim, clone_run, weight / copies))
+            elif level > 0:
+                next_branches.append((sim, run, weight))
+            elif random.random() < survival_prob:
+                next_branches.append((sim, run, weight / survival_prob))
+            else:
+                sim.close()  # Killed by roulette; a cloned trace holds its own file
+        branches = next_branches
+
+    no_leader = split_brain = total_weight = 0.0
+    for sim, run, weight in branches:
+        total_weight += weight
+        start = sim.current_time
+        _advance(sim, run, duration)
+        simulated += sim.current_time - start
+        metrics = sim.finish_run(run)
+        sim.close()
+        if metrics.final_leaders == 0:
+            no_leader += weight
+        elif metrics.final_leaders > 1:
+            split_brain += weight
+    return no_leader, split_brain, total_weight, simulated
+
+def estimate_failure_probability(node_class, config: dict, roots: int, duration: float = 5.0,
+                                 split_start: Optional[float] = None, checkpoint_interval: float = 0.25,
+                                 split_factor: int = 2, survival_prob: float = 1.0,
+                                 settle_time: float = 0.5, max_branches: int = 16,
+                                 z: float = 1.96) -> RareEventEstimate:
+    """Estimate the probability that a run ends with zero or multiple leaders, with a
+    normal-approximation confidence interval over independent roots. If no root
+    saw a failure the interval is one-sided, [0, 1 - alpha^(1/roots)] with alpha
+    the upper tail beyond z (about 3.7/roots at z=1.96); counting roots rather
+    than branches keeps it conservative. Splitting starts one second before the
+    end by default, since that is when a branch's state still decides its outcome."""
+    if split_start is None:
+        split_start = max(config["leader_kill_time"], duration - 1.0)
+    checkpoints = []
+    t = split_start
+    while t < duration:
+        checkpoints.append(t)
+        t += checkpoint_interval
+
+    no_leader, split_brain, simulated, total_weight = [], [], 0.0, 0.0
+    for _ in range(roots):
+        a, b, weight, seconds = run_root(node_class, config, duration, checkpoints,
+                                         split_factor, survival_prob, settle_time, max_branches)
+        no_leader.append(a)
+        split_brain.append(b)
+        total_weight += weight
+        simulated += seconds
+
+    failures = [a + b for a, b in zip(no_leader, split_brain)]
+    p = sum(failures) / roots
+    variance = sum((f - p) ** 2 for f in failures) / (roots - 1) / roots if roots > 1 else float("inf")
+    equivalent = p * (1 - p) / variance if 0 < variance < float("inf") else None
+    if p == 0:
+        # Nothing observed: a zero-width interval would claim certainty
+        alpha = 0.5 * math.erfc(z / math.sqrt(2))
+        ci_low, ci_high = 0.0, 1 - alpha ** (1 / roots)
+    else:
+        halfwidth = z * math.sqrt(variance)
+        ci_low, ci_high = max(0.0, p - halfwidth), min(1.0, p + halfwidth)
+
+    return RareEventEstimate(
+        roots=roots,
+        probability=p,
+        ci_low=ci_low,
+        ci_high=ci_high,
+        p_no_leader=sum(no_leader) / roots,
+        p_split_brain=sum(split_brain) / roots,
+        simulated_seconds=simulated,
+        total_weight=total_weight,
+        equivalent_mc_trials=equivalent
+    )
+
+def main():
+    with open("config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+
+    settings = {
+        "roots": 200,
+        "split_start": None,
+        "checkpoint_interval": 0.25,
+        "split_factor": 2,
+        "survival_prob": 1.0,
+        "settle_time": 0.5,
+        "max_branches": 16,
+        "seed": 0
+    }
+    settings.update(config.get("rare_event", {}))
+    duration = config.get("duration", 5.0)
+
+    print("=" * 100)
+    print("Rare-Event Estimate: P(run ends with zero or multiple leaders)")
+    print("=" * 100)
+    print(f"Setup: {config['num_nodes']} nodes, loss {config.get('message_loss_prob', 0.0)}, "
+          f"{settings['roots']} roots, split x{settings['split_factor']} when risky, "
+          f"survive {settings['survival_prob']} when settled, every {settings['checkpoint_interval']}s")
+    print("=" * 100)
+    print()
+    print(f"{'Algorithm':<10} | {'P(fail)':>9} | {'95% CI':<21} | {'P(none)':>9} | {'P(split)':>9} | "
+          f"{'Cost (runs)':>11} | {'MC-equiv':>9}")
+    print("-" * 100)
+
+    for name, node_class in ALGORITHMS:
+        random.seed(settings["seed"])
+        est = estimate_failure_probability(
+            node_class, config, settings["roots"], duration,
+            split_start=settings["split_start"],
+            checkpoint_interval=settings["checkpoint_interval"],
+            split_factor=settings["split_factor"],
+            survival_prob=settings["survival_prob"],
+            settle_time=settings["settle_time"],
+            max_branches=settings["max_branches"]
+        )
+        ci = f"[{est.ci_low:.2e}, {est.ci_high:.2e}]"
+        cost = est.simulated_seconds / duration
+        mc_equiv = f"{est.equivalent_mc_trials:.0f}" if est.equivalent_mc_trials is not None else "n/a"
+        print(f"{name:<10} | {est.probability:9.2e} | {ci:<21} | {est.p_no_leader:9.2e} | "
+              f"{est.p_split_brain:9.2e} | {cost:11.1f} | {mc_equiv:>9}")
+    print()
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
 from simulator import Node, Message, NodeState
-from typing import List
+from typing import List, Dict, Optional
 
 class RingNode(Node):
-    def __init__(self, node_id: int, total_nodes: int):
-        super().__init__(node_id, total_nodes)
+    DEFAULT_TIMEOUTS = {
+        "leader_timeout": 0.5,
+        "ping_interval": 0.5,
+        "ping_timeout": 0.3,
+        "token_interval": 0.2
+    }
+
+    def __init__(self, node_id: int, total_nodes: int, timeouts: Optional[Dict[str, float]] = None):
+        super().__init__(node_id, total_nodes, timeouts)
         self.election_ids = []
         self.participant = False
         
@@ -54,7 +61,7 @@ class RingNode(Node):
                 self.ping_timeout = None
                 
         elif msg.type == "TOKEN":
-            self.leader_timeout = current_time + 0.5
+            self.leader_timeout = current_time + self.timeouts["leader_timeout"]
             if self.state == NodeState.LEADER:
                 # Token returned to leader
                 pass
@@ -88,7 +95,7 @@ class RingNode(Node):
                     self.last_token_sent = current_time # Start sending tokens
                 else:
                     self.state = NodeState.FOLLOWER
-                    self.leader_timeout = current_time + 0.5
+                    self.leader_timeout = current_time + self.timeouts["leader_timeout"]
                     
                 responses.append(Message(
                     from_node=self.node_id,
@@ -116,7 +123,7 @@ class RingNode(Node):
                     self.state = NodeState.LEADER
                 else:
                     self.state = NodeState.FOLLOWER
-                    self.leader_timeout = current_time + 0.5
+                    self.leader_timeout = current_time + self.timeouts["leader_timeout"]
                     
                 responses.append(Message(
                     from_node=self.node_id,
@@ -145,7 +152,7 @@ class RingNode(Node):
                 timestamp=current_time
             ))
 
-        if current_time - self.last_ping_sent >= 0.5:
+        if current_time - self.last_ping_sent >= self.timeouts["ping_interval"]:
             self.last_ping_sent = current_time
             responses.append(Message(
                 from_node=self.node_id,
@@ -156,7 +163,7 @@ class RingNode(Node):
             ))
             # Only set timeout if not already waiting (or reset it?)
             # Let's reset it.
-            self.ping_timeout = current_time + 0.3
+            self.ping_timeout = current_time + self.timeouts["ping_timeout"]
 
         if self.ping_timeout and current_time >= self.ping_timeout:
             # Neighbor failed. Move to next.
@@ -173,11 +180,11 @@ class RingNode(Node):
                     data={},
                     timestamp=current_time
                 ))
-                self.ping_timeout = current_time + 0.3
+                self.ping_timeout = current_time + self.timeouts["ping_timeout"]
 
         # 2. Leader Logic
         if self.state == NodeState.LEADER:
-            if current_time - self.last_token_sent >= 0.2:
+            if current_time - self.last_token_sent >= self.timeouts["token_interval"]:
                 self.last_token_sent = current_time
                 responses.append(Message(
                     from_node=self.node_id,
@@ -196,3 +203,15 @@ class RingNode(Node):
                 
         return responses
 
+    def next_wakeup(self) -> float:
+        if self.next_neighbor != (self.node_id + 1) % self.total_nodes:
+            # Probing the original neighbor every tick
+            return 0.0
+        wakeups = [self.last_ping_sent + self.timeouts["ping_interval"]]
+        if self.ping_timeout:
+            wakeups.append(self.ping_timeout)
+        if self.state == NodeState.LEADER:
+            wakeups.append(self.last_token_sent + self.timeouts["token_interval"])
+        if self.state == NodeState.FOLLOWER and self.leader_id is not None and self.leader_timeout:
+            wakeups.append(self.leader_timeout)
+        return min(wakeups)
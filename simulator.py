@@ -2,9 +2,21 @@ import time
 import random
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Tuple
+from typing import List, Optional, Dict, Tuple, Callable, Any
 from enum import Enum
 import heapq
+from collections import deque
+
+# Window for peak per-link throughput, in seconds
+LINK_WINDOW = 0.1
+
+# Default allowed relative error of an early-stopped run's extrapolated totals,
+# and the standard deviations of counting noise that must fit inside it
+RATE_TOLERANCE = 0.05
+RATE_SIGMAS = 2.0
+
+# Fixed per-message framing: ids, type tag, timestamp, transport headers
+MESSAGE_HEADER_BYTES = 48
 
 @dataclass
 class Message:
@@ -13,6 +25,55 @@ class Message:
     type: str
     data: Dict
     timestamp: float
+    size: int = 0  # Estimated wire size in bytes, filled in by Simulator.send_message
+
+def estimate_size(value: Any) -> int:
+    """Rough serialized size of a message payload in bytes (compact binary encoding)."""
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float)):
+        return 8
+    if isinstance(value, str):
+        return 2 + len(value)
+    if isinstance(value, dict):
+        return 2 + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return 2 + sum(estimate_size(v) for v in value)
+    return 8
+
+def message_size(msg: Message) -> int:
+    return MESSAGE_HEADER_BYTES + len(msg.type) + estimate_size(msg.data)
+
+@dataclass
+class ServiceModel:
+    """Per-node processing capacity. Costs are CPU seconds per message, by message type."""
+    receive_cost: Dict[str, float] = field(default_factory=dict)
+    send_cost: Dict[str, float] = field(default_factory=dict)
+    default_receive_cost: float = 0.0
+    default_send_cost: float = 0.0
+    queue_capacity: Optional[int] = None  # Inbox size; None is unbounded
+    # "tail_drop", or "backpressure": retry delivery of a message that found the inbox
+    # full every step. Senders are not slowed, so this trades drops for retries
+    overflow_policy: str = "tail_drop"
+
+    def __post_init__(self):
+        if self.overflow_policy not in ("tail_drop", "backpressure"):
+            raise ValueError(f"Unknown overflow_policy: {self.overflow_policy}")
+
+    def receive_cost_of(self, msg: "Message") -> float:
+        return self.receive_cost.get(msg.type, self.default_receive_cost)
+
+    def send_cost_of(self, msg: "Message") -> float:
+        return self.send_cost.get(msg.type, self.default_send_cost)
+
+@dataclass
+class LeadershipInterval:
+    """A span of simulated time during which the set of live leaders did not change."""
+    start: float
+    end: float
+    leader_count: int
+    leader_id: Optional[int] = None  # Only set when exactly one leader
+    leader_ids: Tuple[int, ...] = ()  # Every live leader, sorted
 
 @dataclass
 class Metrics:
@@ -22,7 +83,68 @@ class Metrics:
     final_leaders: int = 0
     messages_election: int = 0
     messages_reelection: int = 0
-    
+    # Leader availability, derived from the timeline
+    availability: float = 0.0
+    leaderless_time: float = 0.0
+    split_brain_time: float = 0.0
+    leader_changes: int = 0  # Changes in the set of live leaders, not counting leaderless gaps
+    # Service model (zero unless the simulator has one)
+    queue_drops: int = 0
+    queue_deferrals: int = 0
+    mean_queue_delay: float = 0.0
+    max_queue_delay: float = 0.0
+    # Network cost, counted for delivered messages like messages_sent
+    bytes_sent: int = 0
+    bytes_election: int = 0
+    bytes_reelection: int = 0
+    # Busiest single link over any 100ms window (utilization needs a bandwidth limit)
+    peak_link_bytes_per_sec: float = 0.0
+    peak_link_utilization: float = 0.0
+    # When the injected crash actually fired (None if it didn't)
+    crash_time: Optional[float] = None
+    # Set when the run stopped early: the time it stopped; totals are extrapolated to the duration
+    stopped_at: Optional[float] = None
+    timeline: List[LeadershipInterval] = field(default_factory=list)
+
+    def leaderless_windows(self) -> List[LeadershipInterval]:
+        return [iv for iv in self.timeline if iv.leader_count == 0]
+
+    def split_brain_windows(self) -> List[LeadershipInterval]:
+        return [iv for iv in self.timeline if iv.leader_count > 1]
+
+@dataclass
+class SimulationRun:
+    """Fault schedule and bookkeeping for one run_simulation call."""
+    duration: float
+    kill_time: float
+    restart_time: Optional[float] = None
+    killed_node: Optional[int] = None
+    partition_start: Optional[float] = None
+    partition_end: Optional[float] = None
+    partition_groups: Optional[List[List[int]]] = None
+    quiescence_window: Optional[float] = None
+    rate_tolerance: float = RATE_TOLERANCE
+    metrics: Metrics = field(default_factory=Metrics)
+
+    election_start_time: float = 0.0
+    reelection_start_time: Optional[float] = None
+    has_initial_leader: bool = False
+    election_complete_time: Optional[float] = None
+    reelection_complete_time: Optional[float] = None
+    actual_killed_node: int = -1
+
+    msgs_at_election_end: int = 0
+    msgs_at_reelection_start: int = 0
+    msgs_at_reelection_end: int = 0
+    bytes_at_election_end: int = 0
+    bytes_at_reelection_start: int = 0
+    bytes_at_reelection_end: int = 0
+
+    queue_delay_total: float = 0.0
+    queued_messages: int = 0
+    # (time, messages, bytes) every quiescence window since the run converged, for early stopping
+    rate_marks: List[Tuple[float, int, int]] = field(default_factory=list)
+
 class NodeState(Enum):
     FOLLOWER = 1
     CANDIDATE = 2
@@ -30,9 +152,16 @@ class NodeState(Enum):
     CRASHED = 4
 
 class Node(ABC):
-    def __init__(self, node_id: int, total_nodes: int):
+    # Timing parameters in seconds; subclasses list theirs with defaults
+    DEFAULT_TIMEOUTS: Dict[str, float] = {}
+
+    def __init__(self, node_id: int, total_nodes: int, timeouts: Optional[Dict[str, float]] = None):
         self.node_id = node_id
         self.total_nodes = total_nodes
+        unknown = set(timeouts or {}) - set(self.DEFAULT_TIMEOUTS)
+        if unknown:
+            raise ValueError(f"Unknown timeouts for {type(self).__name__}: {sorted(unknown)}")
+        self.timeouts = {**self.DEFAULT_TIMEOUTS, **(timeouts or {})}
         self.state = NodeState.FOLLOWER
         self.leader_id: Optional[int] = None
         self.crashed = False
@@ -48,6 +177,19 @@ class Node(ABC):
     def tick(self, current_time: float) -> List[Message]:
         """Called periodically to handle timeouts."""
         return []
+
+    def client_request(self, command: Any, current_time: float) -> List[Message]:
+        """Handle a client command at a leader. Algorithms without a log have nothing to replicate."""
+        return []
+
+    def is_committed(self, command: Any) -> bool:
+        """Whether a command this node accepted is durable. Without a log, acceptance is enough."""
+        return True
+
+    def next_wakeup(self) -> float:
+        """Earliest time at which tick() may do anything. Used for vectorized ticks;
+        returning 0.0 means the node is ticked every step."""
+        return 0.0
     
     def crash(self):
         self.crashed = True
@@ -59,7 +201,9 @@ class Node(ABC):
         self.leader_id = None
 
 class Simulator:
-    def __init__(self, latency_ms: float, latency_jitter_ms: float = 0.0, message_loss_prob: float = 0.0):
+    def __init__(self, latency_ms: float, latency_jitter_ms: float = 0.0, message_loss_prob: float = 0.0,
+                 vectorized_ticks: bool = False, service_model: Optional[ServiceModel] = None,
+                 bandwidth_mbps: Optional[float] = None, link_model=None):
         self.latency = latency_ms / 1000.0
         self.latency_jitter = latency_jitter_ms / 1000.0
         self.message_loss_prob = message_loss_prob
@@ -67,135 +211,423 @@ class Simulator:
         self.message_queue: List[Tuple[float, int, Message]] = []
         self.msg_counter = 0
         self.nodes: List[Node] = []
+        # Optional struct-of-arrays timer store (see node_store.py)
+        self.vectorized_ticks = vectorized_ticks
+        self.timer_store = None
+        # Called once per step with the current time, after nodes tick (e.g. client workloads)
+        self.tick_hooks: List[Callable[[float], None]] = []
+        # Optional per-node CPU and inbox model; set up in start_run
+        self.service_model = service_model
+        self.busy_until: List[float] = []
+        self.inboxes: Dict[int, deque] = {}
+        # Optional per-link (directional) bandwidth limit with FIFO serialization
+        self.bandwidth = bandwidth_mbps * 1e6 / 8 if bandwidth_mbps else None  # bytes/s
+        self.link_free_at: Dict[Tuple[int, int], float] = {}
+        self.link_window: Dict[Tuple[int, int], Tuple[int, int]] = {}  # link -> (window, bytes)
+        self.peak_link_window_bytes = 0
+        # Optional per-link conditions, e.g. a NetworkTrace or RegionTopology; conditions(from,
+        # to, time) returns (delay, loss), where None (or either part being None) means
+        # the synthetic model above
+        self.link_model = link_model
+
+    def close(self):
+        """Release what the link model holds open, e.g. a NetworkTrace's file."""
+        if hasattr(self.link_model, "close"):
+            self.link_model.close()
         
+    def message_lost(self, from_node: Optional[int], to_node: Optional[int],
+                     when: Optional[float] = None) -> bool:
+        """Draw whether a message on this link is lost, under the link's conditions
+        at when (default: now). None stands for an external client."""
+        if self.link_model is not None:
+            when = self.current_time if when is None else when
+            conditions = self.link_model.conditions(from_node, to_node, when)
+            if conditions is not None and conditions[1] is not None:
+                return conditions[1] > 0 and random.random() < conditions[1]
+        return self.message_loss_prob > 0 and random.random() < self.message_loss_prob
+
+    def link_delay(self, from_node: Optional[int], to_node: Optional[int],
+                   when: Optional[float] = None) -> float:
+        """Draw the one-way delay for a message leaving on this link at when (default: now)."""
+        if self.link_model is not None:
+            when = self.current_time if when is None else when
+            conditions = self.link_model.conditions(from_node, to_node, when)
+            if conditions is not None and conditions[0] is not None:
+                return max(0.001, conditions[0])
+        jitter = random.uniform(-self.latency_jitter, self.latency_jitter) if self.latency_jitter > 0 else 0
+        return max(0.001, self.latency + jitter)
+
     def send_message(self, msg: Message):
-        if self.message_loss_prob > 0 and random.random() < self.message_loss_prob:
+        departure_time = self.current_time
+        if self.service_model is not None:
+            # Outgoing messages are serialized on the sender's CPU
+            departure_time = max(departure_time, self.busy_until[msg.from_node]) + self.service_model.send_cost_of(msg)
+            self.busy_until[msg.from_node] = departure_time
+
+        msg.size = message_size(msg)
+        link = (msg.from_node, msg.to_node)
+        if self.bandwidth is not None:
+            # Wait for the link, then spend the serialization delay on it
+            departure_time = max(departure_time, self.link_free_at.get(link, 0.0)) + msg.size / self.bandwidth
+            self.link_free_at[link] = departure_time
+        self._account_link_bytes(link, departure_time, msg.size)
+
+        # Conditions when the message actually leaves, after any CPU or link queueing
+        if self.message_lost(msg.from_node, msg.to_node, departure_time):
             return
 
-        jitter = random.uniform(-self.latency_jitter, self.latency_jitter) if self.latency_jitter > 0 else 0
-        delivery_time = self.current_time + max(0.001, self.latency + jitter)
+        delivery_time = departure_time + self.link_delay(msg.from_node, msg.to_node, departure_time)
         heapq.heappush(self.message_queue, (delivery_time, self.msg_counter, msg))
         self.msg_counter += 1
+
+    def _account_link_bytes(self, link: Tuple[int, int], when: float, size: int):
+        window = int(when / LINK_WINDOW)
+        current_window, total = self.link_window.get(link, (window, 0))
+        total = total + size if current_window == window else size
+        self.link_window[link] = (window, total)
+        self.peak_link_window_bytes = max(self.peak_link_window_bytes, total)
+
+    def refresh_node(self, node: Node):
+        """Call after changing a node's state from outside the simulator loop."""
+        if self.timer_store is not None:
+            self.timer_store.refresh(node)
+
+    def _live_leaders(self) -> List[Node]:
+        if self.timer_store is not None:
+            return [self.nodes[i] for i in self.timer_store.leaders()]
+        return [n for n in self.nodes if not n.crashed and n.state == NodeState.LEADER]
         
     def run_simulation(self, duration: float, kill_time: float, restart_time: Optional[float] = None, 
                       killed_node: Optional[int] = None,
                       partition_start: Optional[float] = None,
                       partition_end: Optional[float] = None,
-                      partition_groups: Optional[List[List[int]]] = None) -> Metrics:
-        metrics = Metrics()
-        election_start_time = self.current_time
-        reelection_start_time = None
-        has_initial_leader = False
-        election_complete_time = None
-        reelection_complete_time = None
-        actual_killed_node = -1
-        
-        msgs_at_election_end = 0
-        msgs_at_reelection_start = 0
-        msgs_at_reelection_end = 0
+                      partition_groups: Optional[List[List[int]]] = None,
+                      quiescence_window: Optional[float] = None,
+                      rate_tolerance: float = RATE_TOLERANCE) -> Metrics:
+        """Run to duration. With a quiescence_window, stop early once the run has
+        converged (see converged()) and the message rate, counted over windows of
+        quiescence_window since then, is known well enough: RATE_SIGMAS standard
+        deviations of it, carried over the rest of the run, must be within
+        rate_tolerance of the extrapolated message total."""
+        if quiescence_window is not None and quiescence_window <= 0:
+            raise ValueError("quiescence_window must be positive")
+        if rate_tolerance <= 0:
+            raise ValueError("rate_tolerance must be positive")
+        run = self.start_run(duration, kill_time, restart_time, killed_node,
+                             partition_start, partition_end, partition_groups)
+        run.quiescence_window = quiescence_window
+        run.rate_tolerance = rate_tolerance
+        while self.current_time < run.duration:
+            self.step(run)
+            if run.quiescence_window is None:
+                continue
+            marks = run.rate_marks
+            if not self.converged(run):
+                marks.clear()
+            elif not marks or self.current_time - marks[-1][0] >= run.quiescence_window:
+                marks.append((self.current_time, run.metrics.messages_sent, run.metrics.bytes_sent))
+                if self._rate_settled(run):
+                    run.metrics.stopped_at = self.current_time
+                    break
+        return self.finish_run(run)
+
+    def _rate_settled(self, run: "SimulationRun") -> bool:
+        marks = run.rate_marks
+        if len(marks) < 3:
+            return False
+        counts = [end[1] - start[1] for start, end in zip(marks, marks[1:])]
+        windows = len(counts)
+        mean = sum(counts) / windows
+        # Per-window variance: at least Poisson (+1 so quiet windows don't look exact),
+        # more if the counts themselves scatter, e.g. bursty periodic traffic
+        variance = max(mean + 1, sum((c - mean) ** 2 for c in counts) / (windows - 1))
+        measured = marks[-1][0] - marks[0][0]
+        remaining = run.duration - self.current_time
+        rate = sum(counts) / measured
+        rate_error = RATE_SIGMAS * (variance * windows) ** 0.5 / measured
+        return rate_error * remaining <= run.rate_tolerance * (run.metrics.messages_sent + rate * remaining)
+
+    def converged(self, run: "SimulationRun") -> bool:
+        """No fault is still to come within the run, and for the quiescence window
+        there has been a single leader and no fault has fired, so takeover and
+        heal bursts are over."""
+        now = self.current_time
+        if run.kill_time < run.duration and run.actual_killed_node == -1 and now <= run.kill_time + 0.01:
+            return False
+        timeline = run.metrics.timeline
+        if not timeline or timeline[-1].leader_count != 1:
+            return False
+        settled_since = timeline[-1].start
+        fired = [run.partition_end]
+        if run.actual_killed_node != -1:
+            fired.append(run.restart_time)
+        for fault_time in fired:
+            if fault_time and fault_time < run.duration:
+                if now <= fault_time + 0.01:
+                    return False
+                settled_since = max(settled_since, fault_time)
+        return now - settled_since >= run.quiescence_window
+
+    def start_run(self, duration: float, kill_time: float, restart_time: Optional[float] = None,
+                  killed_node: Optional[int] = None,
+                  partition_start: Optional[float] = None,
+                  partition_end: Optional[float] = None,
+                  partition_groups: Optional[List[List[int]]] = None) -> "SimulationRun":
+        """Begin a run that is advanced with step() and closed with finish_run().
+        The (simulator, run) pair can be deep-copied mid-run to branch it."""
+        run = SimulationRun(
+            duration=duration,
+            kill_time=kill_time,
+            restart_time=restart_time,
+            killed_node=killed_node,
+            partition_start=partition_start,
+            partition_end=partition_end,
+            partition_groups=partition_groups,
+            election_start_time=self.current_time
+        )
+
+        if self.vectorized_ticks:
+            from node_store import NodeTimerStore
+            self.timer_store = NodeTimerStore(self.nodes)
+
+        if self.service_model is not None:
+            self.busy_until = [self.current_time] * len(self.nodes)
+            self.inboxes = {}
+        self.link_free_at = {}
+        self.link_window = {}
+        self.peak_link_window_bytes = 0
         
         initial_msgs = self.nodes[1].start_election(self.current_time)
+        self.refresh_node(self.nodes[1])
         for msg in initial_msgs:
             self.send_message(msg)
-        
-        while self.current_time < duration:
-            # Handle kill
-            if abs(self.current_time - kill_time) < 0.01 and actual_killed_node == -1:
-                target_node = killed_node
-                if target_node is None:
-                    # Find current leader
-                    leaders = [n for n in self.nodes if n.state == NodeState.LEADER and not n.crashed]
-                    if leaders:
-                        target_node = leaders[0].node_id
-                    else:
-                        # No leader? Kill node 0
-                        target_node = 0
-                
-                if not self.nodes[target_node].crashed:
-                    self.nodes[target_node].crash()
-                    actual_killed_node = target_node
-                    reelection_start_time = self.current_time
-                    has_initial_leader = True
-                    msgs_at_reelection_start = metrics.messages_sent
-                    
-                    # Magic leader invalidation removed. Nodes must detect failure themselves.
-            
-            # Handle restart
-            if restart_time and abs(self.current_time - restart_time) < 0.01 and actual_killed_node != -1:
-                if self.nodes[actual_killed_node].crashed:
-                    self.nodes[actual_killed_node].restart()
-                    restart_msgs = self.nodes[actual_killed_node].start_election(self.current_time)
-                    for msg in restart_msgs:
-                        self.send_message(msg)
+        return run
+
+    def step(self, run: "SimulationRun"):
+        """Advance the simulation by one 10ms step."""
+        metrics = run.metrics
+
+        # Handle kill
+        if abs(self.current_time - run.kill_time) < 0.01 and run.actual_killed_node == -1:
+            target_node = run.killed_node
+            if target_node is None:
+                # Find current leader
+                leaders = self._live_leaders()
+                if leaders:
+                    target_node = leaders[0].node_id
+                else:
+                    # No leader? Kill node 0
+                    target_node = 0
             
-            # Process messages due now
-            while self.message_queue and self.message_queue[0][0] <= self.current_time:
-                _, _, msg = heapq.heappop(self.message_queue)
-                
-                if self.nodes[msg.to_node].crashed:
-                    continue
+            if not self.nodes[target_node].crashed:
+                self.nodes[target_node].crash()
+                self.refresh_node(self.nodes[target_node])
+                run.actual_killed_node = target_node
+                run.reelection_start_time = self.current_time
+                run.has_initial_leader = True
+                run.msgs_at_reelection_start = metrics.messages_sent
+                run.bytes_at_reelection_start = metrics.bytes_sent
                 
-                # Partition check
-                if partition_start and partition_end and partition_groups:
-                    if partition_start <= self.current_time <= partition_end:
-                        # Check if from_node and to_node are in the same group
-                        in_same_group = False
-                        for group in partition_groups:
-                            if msg.from_node in group and msg.to_node in group:
-                                in_same_group = True
-                                break
-                        if not in_same_group:
-                            continue # Drop message due to partition
-
-                metrics.messages_sent += 1
-                
-                responses = self.nodes[msg.to_node].receive_message(msg, self.current_time)
-                for response in responses:
-                    self.send_message(response)
+                # Magic leader invalidation removed. Nodes must detect failure themselves.
+        
+        # Handle restart
+        if run.restart_time and abs(self.current_time - run.restart_time) < 0.01 and run.actual_killed_node != -1:
+            if self.nodes[run.actual_killed_node].crashed:
+                self.nodes[run.actual_killed_node].restart()
+                if self.service_model is not None:
+                    # The CPU backlog and inbox died with the process
+                    self.busy_until[run.actual_killed_node] = self.current_time
+                    self.inboxes.pop(run.actual_killed_node, None)
+                restart_msgs = self.nodes[run.actual_killed_node].start_election(self.current_time)
+                self.refresh_node(self.nodes[run.actual_killed_node])
+                for msg in restart_msgs:
+                    self.send_message(msg)
+        
+        # Process messages due now
+        while self.message_queue and self.message_queue[0][0] <= self.current_time:
+            _, _, msg = heapq.heappop(self.message_queue)
             
-            # Tick nodes
-            for node in self.nodes:
-                if not node.crashed:
-                    tick_msgs = node.tick(self.current_time)
-                    for msg in tick_msgs:
-                        self.send_message(msg)
+            if self.nodes[msg.to_node].crashed:
+                continue
             
-            # Check metrics
-            if election_complete_time is None and not has_initial_leader:
-                leader_nodes = [n for n in self.nodes if not n.crashed and n.state == NodeState.LEADER]
-                if leader_nodes:
-                    election_complete_time = self.current_time
-                    has_initial_leader = True
-                    msgs_at_election_end = metrics.messages_sent
-                    
-            if reelection_start_time and reelection_complete_time is None:
-                active_nodes = [n for n in self.nodes if not n.crashed]
-                leader_nodes = [n for n in active_nodes if n.state == NodeState.LEADER]
-                if leader_nodes:
-                    reelection_complete_time = self.current_time
-                    msgs_at_reelection_end = metrics.messages_sent
+            # Partition check
+            if run.partition_start and run.partition_end and run.partition_groups:
+                if run.partition_start <= self.current_time <= run.partition_end:
+                    # Check if from_node and to_node are in the same group
+                    in_same_group = False
+                    for group in run.partition_groups:
+                        if msg.from_node in group and msg.to_node in group:
+                            in_same_group = True
+                            break
+                    if not in_same_group:
+                        continue # Drop message due to partition
+
+            if self.service_model is not None:
+                self._enqueue(run, msg)
+            else:
+                self._deliver(run, msg)
+
+        if self.service_model is not None:
+            self._drain_inboxes(run)
+        
+        # Tick nodes
+        if self.timer_store is not None:
+            # Only nodes whose timers fired run Python logic
+            tick_nodes = [self.nodes[i] for i in self.timer_store.due(self.current_time)]
+        else:
+            tick_nodes = [n for n in self.nodes if not n.crashed]
+        for node in tick_nodes:
+            tick_msgs = node.tick(self.current_time)
+            self.refresh_node(node)
+            for msg in tick_msgs:
+                self.send_message(msg)
+        
+        for hook in self.tick_hooks:
+            hook(self.current_time)
+
+        # Check metrics
+        leader_nodes = self._live_leaders()
+        if run.election_complete_time is None and not run.has_initial_leader:
+            if leader_nodes:
+                run.election_complete_time = self.current_time
+                run.has_initial_leader = True
+                run.msgs_at_election_end = metrics.messages_sent
+                run.bytes_at_election_end = metrics.bytes_sent
                 
-            self.current_time += 0.01
+        if run.reelection_start_time and run.reelection_complete_time is None:
+            if leader_nodes:
+                run.reelection_complete_time = self.current_time
+                run.msgs_at_reelection_end = metrics.messages_sent
+                run.bytes_at_reelection_end = metrics.bytes_sent
+
+        # Record leadership timeline (run-length encoded)
+        leader_ids = tuple(sorted(n.node_id for n in leader_nodes))
+        current = metrics.timeline[-1] if metrics.timeline else None
+        if current is None or current.leader_ids != leader_ids:
+            if current is not None:
+                current.end = self.current_time
+            metrics.timeline.append(LeadershipInterval(
+                start=self.current_time,
+                end=self.current_time,
+                leader_count=len(leader_ids),
+                leader_id=leader_ids[0] if len(leader_ids) == 1 else None,
+                leader_ids=leader_ids
+            ))
+            
+        self.current_time += 0.01
+
+    def _deliver(self, run: "SimulationRun", msg: Message):
+        run.metrics.messages_sent += 1
+        run.metrics.bytes_sent += msg.size
+        
+        responses = self.nodes[msg.to_node].receive_message(msg, self.current_time)
+        self.refresh_node(self.nodes[msg.to_node])
+        for response in responses:
+            self.send_message(response)
+
+    def _enqueue(self, run: "SimulationRun", msg: Message):
+        inbox = self.inboxes.setdefault(msg.to_node, deque())
+        capacity = self.service_model.queue_capacity
+        if capacity is not None and len(inbox) >= capacity:
+            if self.service_model.overflow_policy == "backpressure":
+                # Hold the message in the network and offer it again next step
+                heapq.heappush(self.message_queue, (self.current_time + 0.01, self.msg_counter, msg))
+                self.msg_counter += 1
+                run.metrics.queue_deferrals += 1
+            else:
+                run.metrics.queue_drops += 1
+            return
+        inbox.append((self.current_time, msg))
+
+    def _drain_inboxes(self, run: "SimulationRun"):
+        """Process queued messages for as much CPU time as each node has this step."""
+        step_end = self.current_time + 0.01
+        for node_id in list(self.inboxes):
+            inbox = self.inboxes[node_id]
+            if self.nodes[node_id].crashed:
+                inbox.clear()
+            while inbox and self.busy_until[node_id] < step_end:
+                arrival, msg = inbox.popleft()
+                start = max(arrival, self.busy_until[node_id])
+                delay = start - arrival
+                run.queue_delay_total += delay
+                run.queued_messages += 1
+                run.metrics.max_queue_delay = max(run.metrics.max_queue_delay, delay)
+                self.busy_until[node_id] = start + self.service_model.receive_cost_of(msg)
+                self._deliver(run, msg)
+            if not inbox:
+                del self.inboxes[node_id]
+
+    def finish_run(self, run: "SimulationRun") -> Metrics:
+        metrics = run.metrics
+        if run.queued_messages:
+            metrics.mean_queue_delay = run.queue_delay_total / run.queued_messages
+        if metrics.stopped_at is not None:
+            self._extrapolate(run)
+        elif metrics.timeline:
+            metrics.timeline[-1].end = self.current_time
+        self._summarize_timeline(metrics)
                 
-        leader_count = sum(1 for n in self.nodes if not n.crashed and n.state == NodeState.LEADER)
-        metrics.final_leaders = leader_count
+        metrics.final_leaders = len(self._live_leaders())
+        metrics.crash_time = run.reelection_start_time
         
-        if election_complete_time:
-            metrics.election_time = election_complete_time - election_start_time
+        if run.election_complete_time:
+            metrics.election_time = run.election_complete_time - run.election_start_time
         else:
-            metrics.election_time = kill_time - election_start_time
+            metrics.election_time = run.kill_time - run.election_start_time
             
-        if reelection_start_time:
-            if reelection_complete_time:
-                metrics.reelection_time = reelection_complete_time - reelection_start_time
+        if run.reelection_start_time:
+            if run.reelection_complete_time:
+                metrics.reelection_time = run.reelection_complete_time - run.reelection_start_time
             else:
-                metrics.reelection_time = duration - reelection_start_time
+                metrics.reelection_time = run.duration - run.reelection_start_time
         
-        metrics.messages_election = msgs_at_election_end
-        if msgs_at_reelection_end > 0:
-            metrics.messages_reelection = msgs_at_reelection_end - msgs_at_reelection_start
-        elif msgs_at_reelection_start > 0:
-            metrics.messages_reelection = metrics.messages_sent - msgs_at_reelection_start
+        metrics.messages_election = run.msgs_at_election_end
+        if run.msgs_at_reelection_end > 0:
+            metrics.messages_reelection = run.msgs_at_reelection_end - run.msgs_at_reelection_start
+        elif run.msgs_at_reelection_start > 0:
+            metrics.messages_reelection = metrics.messages_sent - run.msgs_at_reelection_start
+
+        metrics.bytes_election = run.bytes_at_election_end
+        if run.bytes_at_reelection_end > 0:
+            metrics.bytes_reelection = run.bytes_at_reelection_end - run.bytes_at_reelection_start
+        elif run.bytes_at_reelection_start > 0:
+            metrics.bytes_reelection = metrics.bytes_sent - run.bytes_at_reelection_start
+
+        metrics.peak_link_bytes_per_sec = self.peak_link_window_bytes / LINK_WINDOW
+        if self.bandwidth is not None:
+            # Whole messages are binned by send time, so a window can slightly overshoot
+            metrics.peak_link_utilization = min(1.0, metrics.peak_link_bytes_per_sec / self.bandwidth)
                 
         return metrics
 
+    def _extrapolate(self, run: "SimulationRun"):
+        """Fill in an early-stopped run as if the settled leader held until the
+        duration, with traffic continuing at its rate since the run converged."""
+        metrics = run.metrics
+        start_time, start_msgs, start_bytes = run.rate_marks[0]
+        measured = self.current_time - start_time
+        remaining = run.duration - self.current_time
+        metrics.messages_sent += round((metrics.messages_sent - start_msgs) / measured * remaining)
+        metrics.bytes_sent += round((metrics.bytes_sent - start_bytes) / measured * remaining)
+        metrics.timeline[-1].end = run.duration
+
+    @staticmethod
+    def _summarize_timeline(metrics: Metrics):
+        total = 0.0
+        led = 0.0
+        previous_leaders = None
+        for interval in metrics.timeline:
+            span = interval.end - interval.start
+            total += span
+            if interval.leader_count == 0:
+                metrics.leaderless_time += span
+                continue
+            if interval.leader_count > 1:
+                metrics.split_brain_time += span
+            else:
+                led += span
+            if previous_leaders is not None and interval.leader_ids != previous_leaders:
+                metrics.leader_changes += 1
+            previous_leaders = interval.leader_ids
+        metrics.availability = 100.0 * led / total if total > 0 else 0.0
@@ -0,0 +1,111 @@
+import random
+import pytest
+from main import ALGORITHMS, run_algorithm
+
+CONFIG = {
+    "num_nodes": 10,
+    "latency_ms": 50,
+    "latency_jitter_ms": 10,
+    "message_loss_prob": 0.05,
+    "leader_kill_time": 2.0,
+    "optional_restart_time": 3.0,
+    "enable_restart": True,
+    "enable_partition": True,
+    "partition_start_time": 2.5,
+    "partition_end_time": 4.0,
+    "partition_groups": [[0, 1, 2, 3, 4], [5, 6, 7, 8, 9]],
+}
+
+def summary(metrics):
+    return (metrics.messages_sent, metrics.bytes_sent, metrics.final_leaders,
+            [(round(iv.start, 6), round(iv.end, 6), iv.leader_ids) for iv in metrics.timeline])
+
+@pytest.mark.parametrize("name,node_class", ALGORITHMS)
+def test_vectorized_ticks_match_scalar(name, node_class):
+    results = []
+    for vectorized in (False, True):
+        random.seed(7)
+        results.append(summary(run_algorithm(name, node_class, dict(CONFIG, vectorized_ticks=vectorized))))
+    assert results[0] == results[1]
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("max_batch,max_inflight", [(1, 1), (64, 4)])
+def test_raft_never_commits_different_entries_at_an_index(seed, max_batch, max_inflight):
+    from main import build_simulator, fault_schedule
+    from raft import RaftNode
+    from raft_benchmark import CommitTracker
+
+    random.seed(seed)
+    sim = build_simulator(RaftNode, CONFIG, max_batch=max_batch, max_inflight=max_inflight)
+    sim.tick_hooks.append(CommitTracker(sim, client_rate=100.0))
+    committed = {}  # index -> entry, as first seen committed on any node
+
+    def check(current_time):
+        for node in sim.nodes:
+            for index in range(1, node.commit_index + 1):
+                entry = node.log[index - 1]
+                assert committed.setdefault(index, entry) == entry, f"node {node.node_id} index {index}"
+
+    sim.tick_hooks.append(check)
+    sim.run_simulation(duration=6.0, **fault_schedule(CONFIG))
+    assert committed
+
+@pytest.mark.parametrize("name,node_class", ALGORITHMS)
+def test_splitting_weights_sum_to_roots(name, node_class):
+    from rare_event import estimate_failure_probability
+
+    random.seed(1)
+    # A small branch cap also exercises risky branches that are not split
+    est = estimate_failure_probability(node_class, CONFIG, roots=4, duration=5.0,
+                                       checkpoint_interval=0.1, split_factor=3, max_branches=8)
+    assert est.total_weight == pytest.approx(4)
+    # Branches were actually cloned
+    assert est.simulated_seconds > 2 * 4 * 5.0
+
+def write_trace(tmp_path):
+    """The same small trace as CSV and as structured .npy."""
+    import numpy as np
+
+    rng = random.Random(3)
+    rows = []
+    for step in range(60):
+        src, dst = rng.sample(range(CONFIG["num_nodes"]), 2)
+        rtt = "" if step % 11 == 0 else f"{rng.uniform(20, 200):.3f}"
+        rows.append((100.0 + step * 0.1, src, dst, rtt, f"{rng.uniform(0, 0.2):.3f}", int(step % 13 == 0)))
+    csv_path = tmp_path / "trace.csv"
+    csv_path.write_text("time,src,dst,rtt_ms,loss,outage\n" +
+                        "".join(f"{t},{s},{d},{r},{l},{o}\n" for t, s, d, r, l, o in rows))
+    dtype = [("time", "f8"), ("src", "i4"), ("dst", "i4"), ("rtt_ms", "f8"), ("loss", "f8"), ("outage", "u1")]
+    npy_path = tmp_path / "trace.npy"
+    np.save(npy_path, np.array([(t, s, d, float(r) if r else np.nan, float(l), o) for t, s, d, r, l, o in rows],
+                               dtype=dtype))
+    return str(csv_path), str(npy_path)
+
+def test_csv_and_npy_traces_agree(tmp_path):
+    from network_trace import NetworkTrace
+    from main import RaftNode
+
+    csv_path, npy_path = write_trace(tmp_path)
+    with NetworkTrace(csv_path) as csv_trace, NetworkTrace(npy_path) as npy_trace:
+        n = CONFIG["num_nodes"]
+        for step in range(700):
+            t = step * 0.01
+            for src in range(n):
+                for dst in range(n):
+                    if src != dst:
+                        assert csv_trace.conditions(src, dst, t) == npy_trace.conditions(src, dst, t)
+
+    runs = []
+    for path in (csv_path, npy_path):
+        random.seed(5)
+        runs.append(summary(run_algorithm("Raft", RaftNode, dict(CONFIG, network_trace={"path": path}))))
+    assert runs[0] == runs[1]
+
+def test_short_csv_trace_row_is_rejected(tmp_path):
+    from network_trace import NetworkTrace
+
+    path = tmp_path / "trace.csv"
+    path.write_text("time,src,dst,rtt_ms,loss\n0.0,0,1,50,0\n0.1,1,2,50\n")
+    with NetworkTrace(str(path)) as trace:
+        with pytest.raises(ValueError, match="has 4 fields"):
+            trace.conditions(0, 1, 1.0)
@@ -0,0 +1,37 @@
+import random
+from typing import List, Optional, Tuple
+
+class RegionTopology:
+    """Static WAN link model: nodes sit in regions with a fixed RTT between each
+    pair of regions. Used as a Simulator link_model; loss stays with the
+    simulator's message_loss_prob, and nodes outside every region use its
+    synthetic latency."""
+
+    def __init__(self, regions: List[List[int]], rtt_ms: List[List[float]], jitter_ms: float = 0.0):
+        if len(rtt_ms) != len(regions) or any(len(row) != len(regions) for row in rtt_ms):
+            raise ValueError("rtt_ms must be a square matrix with one row per region")
+        self.region_of = {node: r for r, members in enumerate(regions) for node in members}
+        self.rtt_ms = rtt_ms
+        self.jitter = jitter_ms / 1000.0
+
+    def rtt(self, a: int, b: int) -> Optional[float]:
+        """Nominal RTT in seconds between two nodes, or None if either has no region."""
+        if a not in self.region_of or b not in self.region_of:
+            return None
+        return self.rtt_ms[self.region_of[a]][self.region_of[b]] / 1000.0
+
+    def quorum_rtt(self, node: int, peers: List[int]) -> Optional[float]:
+        """RTT by which node hears from a majority of itself plus peers."""
+        rtts = [self.rtt(node, p) for p in peers if p != node]
+        if None in rtts:
+            return None
+        needed = (len(rtts) + 1) // 2
+        return sorted(rtts)[needed - 1] if needed else 0.0
+
+    def conditions(self, from_node: Optional[int], to_node: Optional[int],
+                   sim_time: float) -> Optional[Tuple[Optional[float], Optional[float]]]:
+        rtt = self.rtt(from_node, to_node)
+        if rtt is None:
+            return None
+        jitter = random.uniform(-self.jitter, self.jitter) if self.jitter > 0 else 0
+        return rtt / 2 + jitter, None
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+import yaml
+import heapq
+import random
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from simulator import Simulator, NodeState
+from main import ALGORITHMS, build_simulator, run_algorithm, get_percentile
+
+@dataclass
+class ClientRequest:
+    request_id: int
+    created: float
+    target: int = 0
+    attempts: int = 0
+    redirects: int = 0
+    attempt_deadline: float = 0.0
+    completed: Optional[float] = None
+    failed: bool = False
+
+class Workload:
+    """Open-loop client traffic against whichever node the client believes is leader.
+
+    Requests arrive as a Poisson process and travel over the simulator's links
+    (same latency, jitter and loss as node traffic). A non-leader answers with a
+    redirect to its leader_id, a silent attempt times out and is retried at
+    another node, and a request that exhausts max_attempts fails. A leader
+    acknowledges once node.is_committed() holds, so for Raft a request only
+    succeeds after a majority has the entry.
+    """
+
+    def __init__(self, sim: Simulator, rate: float, request_timeout: float = 0.5, max_attempts: int = 5):
+        self.sim = sim
+        self.rate = rate
+        self.request_timeout = request_timeout
+        self.max_attempts = max_attempts
+
+        self.requests: List[ClientRequest] = []
+        self.inflight = {}       # request id -> ClientRequest, not yet completed or failed
+        self.awaiting_commit = {}  # request id -> (node id, attempt)
+        self.events: List[Tuple[float, int, tuple]] = []
+        self.event_counter = 0
+        self.next_arrival = random.expovariate(rate)
+        self.believed_leader: Optional[int] = None
+
+    def __call__(self, current_time: float):
+        while self.next_arrival <= current_time:
+            request = ClientRequest(request_id=len(self.requests), created=self.next_arrival)
+            self.requests.append(request)
+            self.inflight[request.request_id] = request
+            self._send(request, self._pick_target(), current_time)
+            self.next_arrival += random.expovariate(self.rate)
+
+        while self.events and self.events[0][0] <= current_time:
+            _, _, event = heapq.heappop(self.events)
+            if event[0] == "arrive":
+                self._on_arrival(event[1], event[2], event[3], current_time)
+            else:
+                self._on_response(event[1], event[2], event[3], event[4], current_time)
+
+        for request_id, (node_id, attempt) in list(self.awaiting_commit.items()):
+            node = self.sim.nodes[node_id]
+            if node.crashed:
+                # Accepted but lost with the node; the client will time out
+                del self.awaiting_commit[request_id]
+            elif node.is_committed(request_id):
+                del self.awaiting_commit[request_id]
+                self._respond(request_id, attempt, node_id, "OK", node_id)
+
+        for request in list(self.inflight.values()):
+            if current_time >= request.attempt_deadline:
+                self.believed_leader = None
+                self._retry(request, self._pick_target(exclude=request.target), current_time)
+
+    def _push(self, when: float, event: tuple):
+        heapq.heappush(self.events, (when, self.event_counter, event))
+        self.event_counter += 1
+
+    def _pick_target(self, exclude: Optional[int] = None) -> int:
+        if self.believed_leader is not None and self.believed_leader != exclude:
+            return self.believed_leader
+        choices = [i for i in range(len(self.sim.nodes)) if i != exclude]
+        return random.choice(choices)
+
+    def _send(self, request: ClientRequest, target: int, current_time: float):
+        request.target = target
+        request.attempts += 1
+        request.attempt_deadline = current_time + self.request_timeout
+        if not self.sim.message_lost(None, target):
+            self._push(current_time + self.sim.link_delay(None, target),
+                       ("arrive", request.request_id, request.attempts, target))
+
+    def _retry(self, request: ClientRequest, target: int, current_time: float):
+        if request.attempts >= self.max_attempts:
+            request.failed = True
+            del self.inflight[request.request_id]
+            return
+        self._send(request, target, current_time)
+
+    def _respond(self, request_id: int, attempt: int, node_id: int, status: str, hint: Optional[int]):
+        if not self.sim.message_lost(node_id, None):
+            self._push(self.sim.current_time + self.sim.link_delay(node_id, None),
+                       ("response", request_id, attempt, status, hint))
+
+    def _on_arrival(self, request_id: int, attempt: int, node_id: int, current_time: float):
+        node = self.sim.nodes[node_id]
+        if node.crashed:
+            return
+        if node.state != NodeState.LEADER:
+            self._respond(request_id, attempt, node_id, "REDIRECT", node.leader_id)
+            return
+        for msg in node.client_request(request_id, current_time):
+            self.sim.send_message(msg)
+        self.sim.refresh_node(node)
+        if node.is_committed(request_id):
+            self._respond(request_id, attempt, node_id, "OK", node_id)
+        else:
+            self.awaiting_commit[request_id] = (node_id, attempt)
+
+    def _on_response(self, request_id: int, attempt: int, status: str, hint: Optional[int], current_time: float):
+        request = self.inflight.get(request_id)
+        if request is None or attempt != request.attempts:
+            return  # Late answer to an earlier attempt, or already done
+        if status == "OK":
+            request.completed = current_time
+            self.believed_leader = hint
+            del self.inflight[request_id]
+            return
+        request.redirects += 1
+        if hint is not None and hint != request.target:
+            self.believed_leader = hint
+            self._retry(request, hint, current_time)
+        else:
+            self.believed_leader = None
+            self._retry(request, self._pick_target(exclude=request.target), current_time)
+
+    def window_stats(self, start: float, end: float) -> dict:
+        """Throughput by completion time, and outcomes/latency of requests created in [start, end)."""
+        created = [r for r in self.requests if start <= r.created < end]
+        latencies = [r.completed - r.created for r in created if r.completed is not None]
+        completed_in_window = sum(1 for r in self.requests if r.completed is not None and start <= r.completed < end)
+        stats = {
+            "throughput": completed_in_window / (end - start) if end > start else 0.0,
+            "requests": len(created),
+            "succeeded": len(latencies),
+            "failed": sum(1 for r in created if r.failed),
+            "redirects": sum(r.redirects for r in created),
+            "p50": None, "p95": None, "p99": None
+        }
+        if latencies:
+            stats["p50"] = get_percentile(latencies, 50)
+            stats["p95"] = get_percentile(latencies, 95)
+            stats["p99"] = get_percentile(latencies, 99)
+        return stats
+
+def phase_windows(config: dict, end: float) -> List[Tuple[str, float, float]]:
+    """Split the run at the crash and the partition window."""
+    boundaries = [(config["leader_kill_time"], "after crash")]
+    if config.get("enable_partition"):
+        boundaries.append((config["partition_start_time"], "partition"))
+        boundaries.append((config["partition_end_time"], "after partition"))
+    boundaries.sort()
+
+    windows = []
+    label, start = "before crash", 0.0
+    for boundary, next_label in boundaries:
+        if boundary >= end:
+            break
+        windows.append((label, start, boundary))
+        label, start = next_label, boundary
+    windows.append((label, start, end))
+    return windows
+
+def format_ms(value) -> str:
+    return f"{value * 1000:.0f}" if value is not None else "n/a"
+
+def main():
+    with open("config.yaml", "r") as f:
+        config = yaml.safe_load(f)
+
+    settings = {"rate": 100.0, "request_timeout": 0.5, "max_attempts": 5}
+    settings.update(config.get("workload", {}))
+
+    print("=" * 96)
+    print("Client Workload Through Leader Failover")
+    print("=" * 96)
+    print(f"Setup: {config['num_nodes']} nodes, {config['latency_ms']}ms latency, "
+          f"{settings['rate']:.0f} req/s open loop, {settings['request_timeout']}s timeout, "
+          f"{settings['max_attempts']} attempts")
+    print("=" * 96)
+    print()
+    print(f"{'Algorithm':<10} | {'Window':<15} | {'Req/s':>6} | {'OK':>5} | {'Failed':>6} | "
+          f"{'Redirects':>9} | {'P50/P95/P99 (ms)':<18}")
+    print("-" * 96)
+
+    for name, node_class in ALGORITHMS:
+        sim = build_simulator(node_class, config)
+        workload = Workload(sim, settings["rate"], settings["request_timeout"], settings["max_attempts"])
+        sim.tick_hooks.append(workload)
+        # Client traffic is measured up to the duration, so never stop early
+        run_algorithm(name, node_class, dict(config, quiescence_window=None), sim=sim)
+        sim.close()
+
+        for window, start, end in phase_windows(config, sim.current_time):
+            s = workload.window_stats(start, end)
+            latency = f"{format_ms(s['p50'])}/{format_ms(s['p95'])}/{format_ms(s['p99'])}"
+            print(f"{name:<10} | {window:<15} | {s['throughput']:6.1f} | {s['succeeded']:>5} | "
+                  f"{s['failed']:>6} | {s['redirects']:>9} | {latency:<18}")
+        print("-" * 96)
+    print()
+
+if __name__ == "__main__":
+    main()